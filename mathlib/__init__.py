@@ -0,0 +1,49 @@
+# mathlib/__init__.py
+
+import importlib
+import os
+
+# public names exported from the package and the submodule each lives in. A
+# submodule is only imported the first time one of its names is used, so e.g.
+# mathlib.binomial_pmf never loads matplotlib.
+_EXPORTS = {
+    'util': ('factorize', 'get_prime_factors', 'is_prime', 'iter_primes', 'primes_in_range', 'primes_up_to'),
+    'calc': ('integrate', 'integrate_nd'),
+    'series': ('fibonacci', 'fibonacci_sequence', 'get_fibonacci', 'sum_integers', 'sum_integers_batch', 'sum_powers'),
+    'combinatorics': ('factorial', 'log_factorial', 'n_choose_k'),
+    'probability': (
+        'coin_toss', 'coin_tosses', 'die_roll', 'die_rolls', 'DiscreteSampler', 'Die',
+        'binomial_pmf', 'binomial_logpmf', 'geometric_pmf', 'geometric_logpmf', 'poisson_pmf', 'poisson_logpmf',
+        'sum_pmf', 'dice_sum_pmf',
+        'normal_pdf', 'uniform_pdf', 'exp_pdf', 'doubly_exp_pdf',
+        'Normal', 'Exponential', 'Laplace', 'Uniform',
+    ),
+    'simulation': ('run_simulation', 'SimulationResult'),
+    'stats': ('StreamingStats',),
+    'cache': ('EvaluationCache', 'enable_cache', 'disable_cache', 'evaluation_cache'),
+    'plotting': (
+        'plot_2d_function', 'plot_3d_function', 'plot_bar_chart', 'plot_histogram', 'plot_series',
+        'render_figure', 'render_batch', 'save_figure',
+    ),
+}
+
+_LAZY_NAMES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_EXPORTS) + list(_LAZY_NAMES)
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _LAZY_NAMES:
+        value = getattr(importlib.import_module(f'{__name__}.{_LAZY_NAMES[name]}'), name)
+        # keep it so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+
+# MATHLIB_INSTRUMENT turns on mathlib.instrument for the whole process
+if os.environ.get('MATHLIB_INSTRUMENT'):
+    importlib.import_module(f'{__name__}.instrument')._enable_from_environment()
@@ -0,0 +1,249 @@
+# mathlib/benchmark.py
+#
+# Benchmarks for the mathlib hot paths. Run them all with
+#
+#     python -m mathlib.benchmark --output baseline.json
+#
+# and later check for regressions against the stored results with
+#
+#     python -m mathlib.benchmark --baseline baseline.json
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from datetime import datetime, timezone
+from functools import partial
+from mathlib.calc import integrate
+from mathlib.combinatorics import n_choose_k
+from mathlib.probability import (
+    DiscreteSampler, Normal, binomial_pmf, coin_tosses, die_rolls, exp_pdf, normal_pdf, pascals_triangle, poisson_pmf)
+from mathlib.series import fibonacci, get_fibonacci
+from mathlib.util import factorize, get_prime_factors
+
+# a benchmark that is this much slower than the baseline counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# each measurement repeats the call for at least this many seconds
+DEFAULT_MIN_TIME = 0.2
+
+# measurements per scale; the fastest is kept, as the others were slowed down by something else
+REPEAT = 3
+
+def _factor_range(n: int):
+    start = 10**9
+    return lambda: [get_prime_factors(N) for N in range(start, start + n)]
+
+def _rng_sampler(sample, n: int):
+    rng = np.random.default_rng(0)
+    return lambda: sample(n, rng=rng)
+
+# name: (setup, scales). setup(n) returns a callable with no arguments that does
+# work of size n, so preparing the inputs is not timed.
+BENCHMARKS = {
+    'get_prime_factors': (_factor_range, (10, 100, 1000)),
+    'factorize': (lambda n: partial(factorize, np.arange(2, n + 2)), (10**3, 10**4, 10**5)),
+    'integrate': (lambda n: partial(integrate, np.sin, 0, np.pi, np.pi / n, 'trapezoid'), (10**3, 10**4, 10**5)),
+    'get_fibonacci': (lambda n: partial(get_fibonacci, n), (10**2, 10**3, 10**4)),
+    'fibonacci': (lambda n: partial(fibonacci, n), (10**3, 10**4, 10**5)),
+    'n_choose_k': (lambda n: partial(n_choose_k, n, n // 2), (10**2, 10**3, 10**4)),
+    'pascals_triangle': (lambda n: partial(pascals_triangle, n), (10, 100, 300)),
+    'binomial_pmf': (lambda n: partial(binomial_pmf, n, np.arange(n + 1), 0.3), (10**3, 10**4, 10**5)),
+    'poisson_pmf': (lambda n: partial(poisson_pmf, np.arange(n), 4.0), (10**3, 10**4, 10**5)),
+    'normal_pdf': (lambda n: partial(normal_pdf, np.linspace(-5, 5, n)), (10**3, 10**4, 10**5)),
+    'exp_pdf': (lambda n: partial(exp_pdf, np.linspace(0, 5, n), 1.5), (10**3, 10**4, 10**5)),
+    'die_rolls': (partial(_rng_sampler, die_rolls), (10**3, 10**4, 10**5)),
+    'coin_tosses': (partial(_rng_sampler, coin_tosses), (10**3, 10**4, 10**5)),
+    'discrete_sampler': (partial(_rng_sampler, DiscreteSampler(np.arange(1, 101)).sample), (10**3, 10**4, 10**5)),
+    'normal_sample': (partial(_rng_sampler, Normal(0, 1).sample), (10**3, 10**4, 10**5)),
+}
+
+def _run(func, number: int) -> float:
+    """
+    Return the wall time of number calls of func.
+    """
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+def _time_per_call(func, min_time: float) -> float:
+    """
+    Return the best time per call of func over REPEAT measurements of at least min_time / REPEAT seconds.
+    """
+    # grow the number of calls until one measurement takes long enough to time reliably
+    number, elapsed = 1, _run(func, 1)
+    while elapsed < min_time / REPEAT:
+        number = max(2 * number, int(number * min_time / REPEAT / max(elapsed, 1e-9)))
+        elapsed = _run(func, number)
+
+    best = min([elapsed] + [_run(func, number) for _ in range(REPEAT - 1)])
+    return best / number
+
+def _peak_memory(func) -> int:
+    """
+    Return the most memory allocated at once during a call of func, in bytes.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] - start
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+def scaling_exponent(scales: list, seconds: list) -> float:
+    """
+    Return the exponent k of the best fit seconds ~ c * scale^k, by least squares on a log-log scale.
+
+    Parameters:
+    - scales: the input sizes.
+    - seconds: the time per call at each size.
+    """
+    if len(scales) < 2:
+        return float('nan')
+    return float(np.polyfit(np.log(scales), np.log(seconds), 1)[0])
+
+def run_benchmarks(names: list = None, min_time: float = DEFAULT_MIN_TIME, scales: int = None) -> dict:
+    """
+    Run benchmarks and return their results.
+
+    Each benchmark is timed at each of its scales and reports the calls per
+    second, the time per call, the peak memory of one call, and how its time
+    grows with the scale.
+
+    Parameters:
+    - names: the benchmarks to run (default: None, every one in BENCHMARKS).
+    - min_time: the least time spent timing each scale, in seconds (default: DEFAULT_MIN_TIME).
+    - scales: run only the first this many scales of each benchmark (default: None, all of them).
+    """
+    names = list(BENCHMARKS) if names is None else names
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"unknown benchmarks: {sorted(unknown)}")
+
+    results = {}
+    for name in names:
+        setup, sizes = BENCHMARKS[name]
+        runs = []
+        for n in sizes[:scales]:
+            func = setup(n)
+            seconds = _time_per_call(func, min_time)
+            runs.append({'n': n, 'seconds': seconds, 'ops_per_sec': 1 / seconds, 'peak_bytes': _peak_memory(func)})
+
+        results[name] = {
+            'runs': runs,
+            'exponent': scaling_exponent([r['n'] for r in runs], [r['seconds'] for r in runs]),
+        }
+
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.platform(),
+        },
+        'benchmarks': results,
+    }
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Return the regressions of results against baseline.
+
+    A benchmark regresses at a scale when its time per call grew by more than
+    threshold (0.25 is 25% slower). Benchmarks and scales missing from either
+    side are skipped.
+
+    Parameters:
+    - results: the output of run_benchmarks.
+    - baseline: an earlier output of run_benchmarks, e.g. loaded from JSON.
+    - threshold: the allowed slowdown (default: DEFAULT_THRESHOLD).
+    """
+    regressions = []
+    for name, current in results['benchmarks'].items():
+        if name not in baseline.get('benchmarks', {}):
+            continue
+
+        before = {r['n']: r for r in baseline['benchmarks'][name]['runs']}
+        for run in current['runs']:
+            if run['n'] not in before:
+                continue
+            slowdown = run['seconds'] / before[run['n']]['seconds'] - 1
+            if slowdown > threshold:
+                regressions.append({'name': name, 'n': run['n'], 'baseline_seconds': before[run['n']]['seconds'],
+                                    'seconds': run['seconds'], 'slowdown': slowdown})
+
+    return regressions
+
+def _format_bytes(n: int) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.4g} {unit}"
+    return f"{seconds / 1e-9:.4g} ns"
+
+def format_results(results: dict) -> str:
+    """
+    Return the results as a text table.
+
+    Parameters:
+    - results: the output of run_benchmarks.
+    """
+    lines = [f"{'benchmark':<20}{'n':>10}{'ops/sec':>14}{'time/op':>14}{'peak mem':>12}{'exponent':>10}"]
+    for name, result in results['benchmarks'].items():
+        for i, run in enumerate(result['runs']):
+            exponent = f"{result['exponent']:.2f}" if i == 0 else ''
+            lines.append(f"{name if i == 0 else '':<20}{run['n']:>10}{run['ops_per_sec']:>14.4g}"
+                         f"{_format_seconds(run['seconds']):>14}{_format_bytes(run['peak_bytes']):>12}{exponent:>10}")
+    return '\n'.join(lines)
+
+def main(argv: list = None) -> int:
+    """
+    Run the benchmarks from the command line. Returns 1 if any regressed against the baseline, else 0.
+    """
+    parser = argparse.ArgumentParser(prog='python -m mathlib.benchmark', description=main.__doc__)
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="compare against the results in this JSON file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed slowdown against the baseline (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME,
+                        help=f"seconds spent timing each scale (default: {DEFAULT_MIN_TIME})")
+    parser.add_argument('--scales', type=int, help="run only the first this many scales of each benchmark")
+    args = parser.parse_args(argv)
+
+    try:
+        results = run_benchmarks(args.names or None, args.min_time, args.scales)
+    except ValueError as e:
+        parser.error(str(e))
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as file:
+        regressions = compare(results, json.load(file), args.threshold)
+    for r in regressions:
+        print(f"REGRESSION {r['name']} n={r['n']}: {_format_seconds(r['baseline_seconds'])} -> "
+              f"{_format_seconds(r['seconds'])} ({r['slowdown']:+.0%})")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
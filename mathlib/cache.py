@@ -0,0 +1,166 @@
+# mathlib/cache.py
+
+import threading
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+
+# default memory budget of an evaluation cache, in bytes
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+class EvaluationCache:
+    """
+    A memory-bounded LRU cache of function evaluations over grids.
+
+    Entries are keyed on the function and a hashable description of the grid it
+    was evaluated on, e.g. ('linspace', x_min, x_max, num_points). Functions are
+    matched by identity, except that functools.partial objects are matched by
+    their function and arguments, so partial(normal_pdf, mean=0, sigma=1) built
+    twice hits the same entry. A lambda created anew on every call never hits.
+
+    Cached arrays are made read-only and handed out without copying; results
+    too large to cache are returned as computed.
+
+    Parameters:
+    - max_bytes: the most memory the cached arrays may take up; the least
+      recently used entries are evicted beyond it (default: DEFAULT_MAX_BYTES).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative.")
+
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"EvaluationCache(entries={len(self)}, nbytes={self.nbytes}, max_bytes={self.max_bytes}, hits={self.hits}, misses={self.misses})"
+
+    def get(self, f, grid: tuple, compute) -> np.ndarray:
+        """
+        Return the cached evaluation of f on grid, computing and storing it on a miss.
+
+        Parameters:
+        - f: the function being evaluated.
+        - grid: a hashable description of the points f is evaluated on.
+        - compute: a callable with no arguments that evaluates f on the grid.
+        """
+        key = (_function_key(f), grid)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        values = np.asarray(compute())
+        if values.nbytes > self.max_bytes:
+            return values
+
+        with self._lock:
+            if key in self._entries:
+                values = self._entries[key]
+            else:
+                # only stored arrays are shared, so only they are made read-only
+                values.flags.writeable = False
+                self._entries[key] = values
+                self.nbytes += values.nbytes
+            # evict the least recently used entries until the cache fits its budget
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+        return values
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        """
+        Return the hit and miss counts, the number of entries and the memory used.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self),
+                'nbytes': self.nbytes, 'max_bytes': self.max_bytes}
+
+def _function_key(f):
+    """
+    Return what identifies f in a cache key: a partial by its function and
+    arguments when they are hashable, anything else by f itself.
+    """
+    if isinstance(f, partial):
+        key = (_function_key(f.func), f.args, tuple(sorted(f.keywords.items())))
+        try:
+            hash(key)
+            return key
+        except TypeError:
+            pass
+    return f
+
+# the cache used by cached_evaluate, or None when caching is off
+_active = None
+
+def enable_cache(max_bytes: int = DEFAULT_MAX_BYTES) -> EvaluationCache:
+    """
+    Turn on evaluation caching for plotting and integration, and return the cache.
+
+    Parameters:
+    - max_bytes: the memory budget of the cache (default: DEFAULT_MAX_BYTES).
+    """
+    global _active
+    _active = EvaluationCache(max_bytes)
+    return _active
+
+def disable_cache() -> None:
+    """
+    Turn off evaluation caching and drop the cache.
+    """
+    global _active
+    _active = None
+
+def get_cache() -> EvaluationCache | None:
+    """
+    Return the active cache, or None when caching is off.
+    """
+    return _active
+
+@contextmanager
+def evaluation_cache(max_bytes: int = DEFAULT_MAX_BYTES):
+    """
+    Cache evaluations inside a with block, restoring the previous cache afterwards.
+
+    Parameters:
+    - max_bytes: the memory budget of the cache (default: DEFAULT_MAX_BYTES).
+    """
+    global _active
+    previous = _active
+    _active = EvaluationCache(max_bytes)
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+def cached_evaluate(f, grid: tuple, compute) -> np.ndarray:
+    """
+    Evaluate f through the active cache, or just call compute when caching is off.
+
+    Parameters:
+    - f: the function being evaluated.
+    - grid: a hashable description of the points f is evaluated on.
+    - compute: a callable with no arguments that evaluates f on the grid.
+    """
+    if _active is None:
+        return compute()
+    return _active.get(f, grid, compute)
@@ -0,0 +1,226 @@
+# mathlib/combinatorics.py
+
+import threading
+import numpy as np
+from bisect import bisect_right
+from collections import OrderedDict
+from math import isqrt, lgamma
+from mathlib import util
+
+# total bit length of the exact factorials kept by the LRU cache (8 MiB); a
+# factorial larger than this on its own is returned without being cached
+FACTORIAL_CACHE_BITS = 2**26
+
+# n_choose_k uses the multiplicative formula below this k and prime factorization above it
+MULTIPLICATIVE_MAX_K = 32
+
+# largest n for which n_choose_k lists the primes up to n to factor the coefficient
+LEGENDRE_MAX_N = 10**8
+
+# largest n whose log(n!) is kept in the lookup table; larger n use log-gamma directly
+LOG_FACTORIAL_TABLE_MAX = 10**6
+
+# log(0!), log(1!), ... computed so far
+_log_factorials = np.zeros(1)
+
+def _range_product(lo: int, hi: int) -> int:
+    """
+    Multiply the integers in [lo, hi) by binary splitting.
+
+    Splitting the range in half keeps the two operands of every big-int
+    multiplication about the same size, which is much faster than multiplying
+    a growing product by one small integer at a time.
+    """
+    if hi - lo <= 8:
+        product = 1
+        for i in range(lo, hi):
+            product *= i
+        return product
+
+    mid = (lo + hi) // 2
+    return _range_product(lo, mid) * _range_product(mid, hi)
+
+def _list_product(values: list, lo: int = 0, hi: int = None) -> int:
+    """
+    Multiply values[lo:hi] by binary splitting.
+    """
+    hi = len(values) if hi is None else hi
+    if hi - lo <= 8:
+        product = 1
+        for v in values[lo:hi]:
+            product *= v
+        return product
+
+    mid = (lo + hi) // 2
+    return _list_product(values, lo, mid) * _list_product(values, mid, hi)
+
+def _legendre(n: int, p: int) -> int:
+    """
+    Return the exponent of the prime p in n!.
+    """
+    e = 0
+    while n:
+        n //= p
+        e += n
+    return e
+
+def _swing(n: int, primes: list) -> int:
+    """
+    Return the swinging factorial n! / (floor(n/2)!)^2 from its prime factorization.
+    """
+    root = isqrt(n)
+    powers = []
+    for p in primes[:bisect_right(primes, n)]:
+        if p > root:
+            if (n // p) & 1:
+                powers.append(p)
+            continue
+
+        q, e = n, 0
+        while q:
+            q //= p
+            e += q & 1
+        if e:
+            powers.append(p**e)
+
+    return _list_product(powers)
+
+def _prime_swing_factorial(n: int, primes: list) -> int:
+    """
+    Return n! as (floor(n/2)!)^2 times the swinging factorial of n.
+    """
+    if n < 2:
+        return 1
+    return _prime_swing_factorial(n // 2, primes)**2 * _swing(n, primes)
+
+# n: n! for the factorials cached so far, least recently used first
+_factorials = OrderedDict()
+_factorial_bits = 0
+_factorial_lock = threading.Lock()
+
+def _cached_factorial(n: int) -> int:
+    global _factorial_bits
+    with _factorial_lock:
+        if n in _factorials:
+            _factorials.move_to_end(n)
+            return _factorials[n]
+
+    result = _factorial(n)
+    bits = result.bit_length()
+    if bits > FACTORIAL_CACHE_BITS:
+        return result
+
+    with _factorial_lock:
+        if n not in _factorials:
+            _factorials[n] = result
+            _factorial_bits += bits
+        # evict the least recently used factorials until the cache fits its budget
+        while _factorial_bits > FACTORIAL_CACHE_BITS:
+            _, evicted = _factorials.popitem(last=False)
+            _factorial_bits -= evicted.bit_length()
+
+    return result
+
+def _factorial(n: int) -> int:
+    if n <= util.SIEVE_BOUND:
+        return _prime_swing_factorial(n, util.primes_up_to(n))
+    return _range_product(1, n + 1)
+
+def factorial(n: int, cache: bool = True) -> int:
+    """
+    Return n!.
+
+    Uses the prime-swing algorithm for n up to util.SIEVE_BOUND, which builds
+    n! from squares and products of prime powers, and binary splitting above it.
+
+    Parameters:
+    - n: a non-negative integer
+    - cache: keep the result in an LRU cache of at most FACTORIAL_CACHE_BITS bits (default: True)
+    """
+    if n < 0:
+        raise ValueError("n cannot be negative in n! operation.")
+
+    return _cached_factorial(n) if cache else _factorial(n)
+
+def n_choose_k(n: int, k: int) -> int:
+    """
+    Return the binomial coefficient n choose k.
+
+    k is replaced by min(k, n-k). Small k use the multiplicative formula
+    n(n-1)...(n-k+1) / k!. Larger k multiply the prime powers that divide the
+    coefficient (Legendre's formula), which avoids dividing huge integers. That
+    needs every prime up to n, so above LEGENDRE_MAX_N the multiplicative formula
+    is used for every k. Its final division is quadratic in the size of the
+    result, which makes such n with k in the hundreds of thousands take seconds
+    and grows fourfold each time k doubles.
+
+    Parameters:
+    - n: total number of elements to choose from in a set
+    - k: number of elements chosen - number of elements in a subset
+    """
+    if n < 0:
+        raise ValueError("n cannot be negative in n choose k operation.")
+    if k < 0 or k > n:
+        raise ValueError("k must be in the range [0, n] in n choose k operation.")
+
+    k = min(k, n - k)
+    if k < MULTIPLICATIVE_MAX_K or n > LEGENDRE_MAX_N:
+        return _range_product(n - k + 1, n + 1) // factorial(k)
+
+    # the shared sieve for small n, the segmented sieve's fixed memory beyond it
+    root = isqrt(n)
+    if n <= util.SIEVE_BOUND:
+        primes = np.array(util.primes_up_to(n), dtype=np.int64)
+    else:
+        primes = util.primes_in_range(2, n + 1)
+
+    powers = []
+    for p in primes[primes <= root].tolist():
+        e = _legendre(n, p) - _legendre(k, p) - _legendre(n - k, p)
+        if e:
+            powers.append(p**e)
+
+    # a prime above sqrt(n) divides each factorial at most floor(n/p) times, so its
+    # exponent in the coefficient is 0 or 1 and all of them are found at once
+    large = primes[primes > root]
+    powers += large[n // large - k // large - (n - k) // large == 1].tolist()
+
+    return _list_product(powers)
+
+def _grow_log_factorials(n: int) -> None:
+    """
+    Extend the log-factorial table to cover n, at least doubling its size each time.
+    """
+    global _log_factorials
+    if n < len(_log_factorials):
+        return
+
+    size = min(max(n + 1, 2 * len(_log_factorials)), LOG_FACTORIAL_TABLE_MAX + 1)
+    # log-gamma for each entry rather than a running sum of logs, so rounding does not accumulate
+    logs = [lgamma(i + 1.0) for i in range(len(_log_factorials), size)]
+    _log_factorials = np.concatenate((_log_factorials, logs))
+
+def log_factorial(n: int | np.ndarray) -> float | np.ndarray:
+    """
+    Return log(n!) for a non-negative integer or an array of them.
+
+    Values up to LOG_FACTORIAL_TABLE_MAX are looked up in a lazily grown table,
+    larger ones are computed with log-gamma.
+
+    Parameters:
+    - n: a non-negative integer or array of non-negative integers
+    """
+    n_arr = np.asarray(n, dtype=np.int64)
+    if (n_arr < 0).any():
+        raise ValueError("n cannot be negative in n! operation.")
+
+    _grow_log_factorials(min(int(n_arr.max(initial=0)), LOG_FACTORIAL_TABLE_MAX))
+    if n_arr.ndim == 0:
+        return float(_log_factorials[n_arr]) if n_arr < len(_log_factorials) else lgamma(int(n_arr) + 1.0)
+
+    result = _log_factorials[np.minimum(n_arr, len(_log_factorials) - 1)]
+    large = n_arr >= len(_log_factorials)
+    if large.any():
+        result[large] = [lgamma(i + 1.0) for i in n_arr[large].tolist()]
+
+    return result
@@ -0,0 +1,356 @@
+# mathlib/instrument.py
+
+import atexit
+import importlib
+import importlib.abc
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import numpy as np
+from contextlib import contextmanager
+from functools import wraps
+
+# the modules whose public functions and methods are instrumented by default
+MODULES = ('calc', 'series', 'util', 'probability', 'plotting')
+
+# set to 1 or all, or a comma separated list of MODULES, to instrument mathlib on import
+ENV_VAR = 'MATHLIB_INSTRUMENT'
+
+# set to a .json, .prom or .folded path to write the profile there when the process exits
+ENV_OUTPUT_VAR = 'MATHLIB_INSTRUMENT_OUTPUT'
+
+FORMATS = ('json', 'prometheus', 'folded')
+
+class _Record:
+    """
+    The running totals of one instrumented function.
+    """
+    __slots__ = ('calls', 'wall', 'cpu', 'size_sum', 'sizes')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.size_sum = 0
+        # argument size histogram: the count of calls for each power-of-two upper bound
+        self.sizes = {}
+
+class Profile:
+    """
+    The measurements collected while instrumentation is on.
+
+    For every instrumented function it keeps the number of calls, the total wall
+    and CPU time spent inside it (including the functions it calls), and a
+    histogram of the size of its largest argument in power-of-two buckets. It
+    also keeps the self time of every call stack, for flame graphs.
+    """
+
+    def __init__(self):
+        self.records = {}
+        # wall time spent in each call stack, not counting the calls it made
+        self.stacks = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def reset(self) -> None:
+        """
+        Drop everything recorded so far.
+        """
+        with self._lock:
+            self.records.clear()
+            self.stacks.clear()
+
+    def _record(self, name: str, stack: tuple, wall: float, self_wall: float, cpu: float, size: int) -> None:
+        bucket = 1 << max(size - 1, 0).bit_length()
+        with self._lock:
+            record = self.records.get(name)
+            if record is None:
+                record = self.records[name] = _Record()
+            record.calls += 1
+            record.wall += wall
+            record.cpu += cpu
+            record.size_sum += size
+            record.sizes[bucket] = record.sizes.get(bucket, 0) + 1
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + self_wall
+
+    def to_dict(self) -> dict:
+        """
+        Return the measurements as {function: {'calls', 'wall_seconds', 'cpu_seconds', 'argument_sizes'}},
+        with argument_sizes mapping each power-of-two upper bound to its count of calls.
+        """
+        with self._lock:
+            return {name: {'calls': r.calls, 'wall_seconds': r.wall, 'cpu_seconds': r.cpu,
+                           'argument_sizes': dict(sorted(r.sizes.items()))}
+                    for name, r in sorted(self.records.items())}
+
+    def to_prometheus(self) -> str:
+        """
+        Return the measurements in the Prometheus text exposition format.
+        """
+        with self._lock:
+            records = sorted(self.records.items())
+            lines = []
+            for metric, kind, help_text, value in (
+                ('mathlib_calls_total', 'counter', 'Calls of each instrumented function.', lambda r: r.calls),
+                ('mathlib_wall_seconds_total', 'counter', 'Wall time spent in each function, including its callees.', lambda r: r.wall),
+                ('mathlib_cpu_seconds_total', 'counter', 'CPU time spent in each function, including its callees.', lambda r: r.cpu),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+                lines += [f'{metric}{{function="{name}"}} {value(r)}' for name, r in records]
+
+            metric = 'mathlib_argument_size'
+            lines += [f"# HELP {metric} Size of the largest argument of each call.", f"# TYPE {metric} histogram"]
+            for name, r in records:
+                cumulative = 0
+                for bound, count in sorted(r.sizes.items()):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{function="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{function="{name}",le="+Inf"}} {r.calls}')
+                lines.append(f'{metric}_sum{{function="{name}"}} {r.size_sum}')
+                lines.append(f'{metric}_count{{function="{name}"}} {r.calls}')
+
+        return '\n'.join(lines) + '\n'
+
+    def to_folded(self) -> str:
+        """
+        Return the self time of each call stack in microseconds, in the folded
+        format read by flamegraph.pl, speedscope and similar tools.
+        """
+        with self._lock:
+            stacks = sorted(self.stacks.items())
+        return ''.join(f"{';'.join(stack)} {round(seconds * 1e6)}\n" for stack, seconds in stacks)
+
+    def write(self, path: str, format: str = None) -> None:
+        """
+        Write the measurements to a file.
+
+        Parameters:
+        - path: the file to write.
+        - format: 'json', 'prometheus' or 'folded' (default: None, from the extension of
+          path: .prom and .txt are prometheus, .folded is folded, anything else json).
+        """
+        if format is None:
+            extension = os.path.splitext(str(path))[1]
+            format = {'.prom': 'prometheus', '.txt': 'prometheus', '.folded': 'folded'}.get(extension, 'json')
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}, received: {format}")
+
+        with open(path, 'w') as file:
+            if format == 'json':
+                json.dump(self.to_dict(), file, indent=2)
+            else:
+                file.write(self.to_prometheus() if format == 'prometheus' else self.to_folded())
+
+def _argument_size(args: tuple, kwargs: dict) -> int:
+    """
+    Return the size of the largest argument: the number of elements of an array or
+    sequence, or the magnitude of an integer.
+    """
+    size = 0
+    for arg in (*args, *kwargs.values()):
+        if isinstance(arg, np.ndarray):
+            size = max(size, arg.size)
+        elif isinstance(arg, (list, tuple, range)):
+            size = max(size, len(arg))
+        elif isinstance(arg, (int, np.integer)) and not isinstance(arg, bool):
+            size = max(size, abs(int(arg)))
+    return size
+
+def _wrap(func, name: str, profile: Profile):
+    """
+    Return func wrapped to record its calls into profile under name.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        local = profile._local
+        stack = getattr(local, 'stack', ())
+        children = getattr(local, 'children', 0.0)
+        local.stack, local.children = stack + (name,), 0.0
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            profile._record(name, local.stack, wall, wall - local.children, cpu, _argument_size(args, kwargs))
+            local.stack, local.children = stack, children + wall
+
+    return wrapper
+
+# the active profile, the (object, attribute, original) of every patch it made,
+# and the import hook instrumenting modules that were not loaded yet
+_profile = None
+_patches = []
+_hook = None
+
+# the original of every wrapper handed out, to unbind wrappers that no patch recorded
+_originals = {}
+
+def _targets(module):
+    """
+    Yield (owner, attribute, qualified name) for the public functions of module and
+    the public methods of its classes.
+    """
+    prefix = module.__name__.rsplit('.', 1)[-1]
+    for attr, value in list(vars(module).items()):
+        if attr.startswith('_') or getattr(value, '__module__', None) != module.__name__:
+            continue
+        if inspect.isfunction(value):
+            yield module, attr, f'{prefix}.{attr}'
+        elif inspect.isclass(value):
+            for method, member in list(vars(value).items()):
+                if not method.startswith('_') and inspect.isfunction(member):
+                    yield value, method, f'{prefix}.{attr}.{method}'
+
+def _instrument_module(module) -> None:
+    """
+    Wrap the targets of module into the active profile.
+    """
+    originals = {}
+    for owner, attr, name in _targets(module):
+        original = vars(owner)[attr]
+        wrapper = _wrap(original, name, _profile)
+        originals[id(original)] = wrapper
+        _originals[wrapper] = original
+        _patches.append((owner, attr, original))
+        setattr(owner, attr, wrapper)
+
+    # point names imported from the module at its wrapper as well
+    for module_name, loaded in list(sys.modules.items()):
+        if (module_name == 'mathlib' or module_name.startswith('mathlib.')) and loaded is not None:
+            for attr, value in list(vars(loaded).items()):
+                if id(value) in originals and vars(loaded)[attr] is not originals[id(value)]:
+                    _patches.append((loaded, attr, value))
+                    setattr(loaded, attr, originals[id(value)])
+
+class _InstrumentingLoader(importlib.abc.Loader):
+    """
+    Run a module's own loader, then instrument the module.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        self.loader.exec_module(module)
+        if _hook is not None and module.__name__ in _hook.names:
+            _hook.names.discard(module.__name__)
+            _instrument_module(module)
+
+class _ImportHook(importlib.abc.MetaPathFinder):
+    """
+    Instrument the named modules when they are first imported.
+    """
+
+    def __init__(self, names: list):
+        self.names = set(names)
+
+    def find_spec(self, fullname: str, path, target=None):
+        if fullname not in self.names:
+            return None
+        # let the other finders locate the module and only swap in the loader
+        for finder in sys.meta_path:
+            if finder is not self and hasattr(finder, 'find_spec'):
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    spec.loader = _InstrumentingLoader(spec.loader)
+                    return spec
+        return None
+
+def enable(modules: tuple = MODULES, lazy: bool = False) -> Profile:
+    """
+    Instrument the public functions and methods of the given mathlib modules and
+    return the Profile they record into.
+
+    The functions are replaced by timing wrappers in their module, in their class,
+    and in every loaded mathlib module that imported them by name, so calls made
+    inside mathlib are recorded too and nest in the call stacks. Nothing is
+    wrapped while instrumentation is off, so it costs nothing then. Calls made
+    in worker processes are not recorded.
+
+    Parameters:
+    - modules: the names of the mathlib modules to instrument (default: MODULES).
+    - lazy: instrument the modules not imported yet when they are first imported,
+      rather than importing them now, so e.g. matplotlib is only loaded if
+      plotting is used (default: False).
+    """
+    global _profile, _hook
+    disable()
+
+    _profile = Profile()
+    pending = []
+    for module_name in modules:
+        name = f'mathlib.{module_name}'
+        if lazy and name not in sys.modules:
+            pending.append(name)
+        else:
+            _instrument_module(importlib.import_module(name))
+
+    if pending:
+        _hook = _ImportHook(pending)
+        sys.meta_path.insert(0, _hook)
+
+    return _profile
+
+def disable() -> None:
+    """
+    Remove the instrumentation wrappers. The last profile stays readable.
+    """
+    global _hook
+    if _hook is not None:
+        sys.meta_path.remove(_hook)
+        _hook = None
+    while _patches:
+        owner, attr, original = _patches.pop()
+        setattr(owner, attr, original)
+
+    # modules imported while instrumentation was on bound the wrappers of their
+    # dependencies, and the package caches the exported names it hands out
+    for module_name, module in list(sys.modules.items()):
+        if (module_name == 'mathlib' or module_name.startswith('mathlib.')) and module is not None:
+            for attr, value in list(vars(module).items()):
+                if inspect.isfunction(value) and value in _originals:
+                    setattr(module, attr, _originals[value])
+    _originals.clear()
+
+def get_profile() -> Profile | None:
+    """
+    Return the profile of the current or last instrumented run, or None.
+    """
+    return _profile
+
+@contextmanager
+def instrument(modules: tuple = MODULES):
+    """
+    Instrument mathlib inside a with block and yield the Profile.
+
+    Parameters:
+    - modules: the names of the mathlib modules to instrument (default: MODULES).
+    """
+    profile = enable(modules)
+    try:
+        yield profile
+    finally:
+        disable()
+
+def _enable_from_environment() -> None:
+    """
+    Turn on instrumentation if ENV_VAR is set, and write the profile at exit if ENV_OUTPUT_VAR is set.
+    """
+    value = os.environ.get(ENV_VAR, '').strip()
+    if value.lower() in ('', '0', 'false', 'no'):
+        return
+
+    modules = MODULES if value.lower() in ('1', 'true', 'yes', 'all') else tuple(m.strip() for m in value.split(','))
+    # only the modules in use are instrumented, so importing mathlib stays light
+    profile = enable(modules, lazy=True)
+
+    path = os.environ.get(ENV_OUTPUT_VAR)
+    if path:
+        atexit.register(profile.write, path)
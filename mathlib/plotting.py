@@ -1,19 +1,373 @@
 # mathlib/plotting.py
 
+import io
 import numpy as np
 import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from mathlib.cache import cached_evaluate
 from mpl_toolkits.mplot3d import Axes3D
 from typing import Callable, List, Union
 
 plot_theme = 'dark_background'
 
+# about how many values evaluate_grid computes at once
+TILE_SIZE = 2**20
+
+# plot_3d_function draws at most this many points along each axis
+RENDER_POINTS = 500
+
+def adaptive_sample(
+    f: Callable[[np.ndarray], np.ndarray],
+    x_min: float,
+    x_max: float,
+    num_points: int = 1000,
+    initial_points: int = None,
+    tol: float = 1e-3
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Samples f on [x_min, x_max], adding points where the curve bends.
+
+    Starts from an even grid and repeatedly evaluates f at the midpoint of every
+    interval that is still being refined. An interval is split when its midpoint
+    is further than tol (relative to the range of f) from the straight line
+    through its ends, so flat and straight stretches stay coarse while peaks and
+    sharp bends are refined. Refinement stops when no interval needs it or the
+    point budget is spent, in which case the worst intervals are split first.
+    Features narrower than the initial spacing can still be missed entirely.
+
+    Parameters:
+    - f: A vectorized function of x.
+    - x_min: Minimum value of x.
+    - x_max: Maximum value of x.
+    - num_points: The maximum number of points returned (default: 1000).
+    - initial_points: Points in the starting grid (default: None, num_points // 8).
+    - tol: The allowed midpoint deviation, as a fraction of the range of f (default: 1e-3).
+
+    Returns the sorted x values and f at each of them.
+    """
+    if num_points < 2:
+        raise ValueError("num_points must be at least 2.")
+
+    initial_points = max(2, min(num_points, num_points // 8 if initial_points is None else initial_points))
+    x = np.linspace(x_min, x_max, initial_points)
+    y = np.broadcast_to(f(x), x.shape).astype(float)
+    active = np.arange(len(x) - 1)
+
+    while len(active) and len(x) < num_points:
+        mid = (x[active] + x[active + 1]) / 2
+        y_mid = np.broadcast_to(f(mid), mid.shape).astype(float)
+
+        finite = y[np.isfinite(y)]
+        scale = np.ptp(finite) if len(finite) else 0
+        error = np.abs(y_mid - (y[active] + y[active + 1]) / 2) / (scale or 1)
+        error = np.nan_to_num(error, nan=0, posinf=np.inf)
+
+        # split the intervals that are off by more than tol, worst first if over budget
+        split = np.flatnonzero(error > tol)
+        if len(split) > num_points - len(x):
+            split = split[np.argsort(error[split])[::-1][:num_points - len(x)]]
+            split.sort()
+        if not len(split):
+            break
+
+        at = active[split] + 1
+        x = np.insert(x, at, mid[split])
+        y = np.insert(y, at, y_mid[split])
+
+        # both halves of every split interval are refined next round
+        left = at + np.arange(len(at)) - 1
+        active = np.sort(np.concatenate((left, left + 1)))
+
+    return x, y
+
+def _minmax_indices(y: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Return the indices of the smallest and largest y in each of buckets equal slices.
+    """
+    size = -(-len(y) // buckets)
+    padded = np.pad(y, (0, size * buckets - len(y)), mode='edge').reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    indices = np.concatenate((offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1)))
+    return np.minimum(indices, len(y) - 1)
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, num_points: int) -> np.ndarray:
+    """
+    Return the indices picked by Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept, the rest are split into num_points - 2
+    buckets, and from each bucket the point forming the largest triangle with
+    the previously picked point and the mean of the next bucket is kept.
+    """
+    edges = np.linspace(1, len(y) - 1, num_points - 1).astype(np.int64)
+    indices = np.empty(num_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, len(y) - 1
+
+    for i in range(num_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        prev = indices[i]
+        area = np.abs((x[prev] - next_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (next_y - y[prev]))
+        indices[i + 1] = lo + area.argmax()
+
+    return indices
+
+def decimate(x: np.ndarray, y: np.ndarray, num_points: int, method: str = 'minmax') -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a long series to about num_points points that draw the same line.
+
+    A line with many more points than the axes has pixels is drawn as a band
+    between the lowest and highest value in each pixel column, so keeping just
+    those extremes looks the same on screen and renders far faster.
+
+    Parameters:
+    - x: The sorted x values.
+    - y: The y values.
+    - num_points: The number of points to keep.
+    - method: 'minmax' keeps the smallest and largest y of each of num_points // 2
+      equal slices, which preserves every peak; 'lttb' keeps one point per slice by
+      Largest-Triangle-Three-Buckets, which preserves the visual shape with fewer
+      points (default: 'minmax').
+
+    Returns the kept x and y values. Series already at most num_points long are returned as is.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if len(x) != len(y):
+        raise ValueError("The length of 'x' and 'y' must be the same.")
+    if method not in ('minmax', 'lttb'):
+        raise ValueError(f"method must be 'minmax' or 'lttb', received: {method}")
+    if num_points < 3:
+        raise ValueError("num_points must be at least 3.")
+    if len(y) <= num_points:
+        return x, y
+
+    if method == 'lttb':
+        indices = _lttb_indices(x, y, num_points)
+    else:
+        indices = _minmax_indices(y, num_points // 2)
+        indices = np.unique(np.concatenate(([0, len(y) - 1], indices)))
+
+    return x[indices], y[indices]
+
+def _pixel_width(ax: Axes) -> int:
+    """
+    Return the width of ax in pixels.
+    """
+    return max(1, int(ax.get_position().width * ax.figure.get_figwidth() * ax.figure.dpi))
+
+def _draw_2d_function(
+    ax: Axes,
+    functions: Union[Callable[[np.ndarray], np.ndarray], List[Callable[[np.ndarray], np.ndarray]]],
+    x_min: float = -10,
+    x_max: float = 10,
+    num_points: int = 1000,
+    title: str = '2D Plot of Functions',
+    adaptive: bool = False
+) -> None:
+    """
+    Draws 2D graphs of one or more functions f(x) vs x onto ax.
+    """
+    # Ensure functions is a list even if a single function is passed
+    if not isinstance(functions, (list, tuple)):
+        functions = [functions]
+
+    # Generate x values
+    x = np.linspace(x_min, x_max, num_points)
+
+    # Plot each function
+    for f in functions:
+        if adaptive:
+            x, y = adaptive_sample(f, x_min, x_max, num_points)
+        else:
+            y = cached_evaluate(f, ('linspace', x_min, x_max, num_points), lambda: f(x))
+        ax.plot(x, y, label=f.__name__ if hasattr(f, '__name__') else 'f(x)')
+
+    # Add title, labels, and grid
+    ax.set_title(title)
+    ax.set_xlabel("x")
+    ax.set_ylabel("f(x)")
+    ax.grid(True)
+
+    # Add legend to distinguish between functions
+    ax.legend()
+
+def _draw_series(
+    ax: Axes,
+    x: np.ndarray,
+    y: Union[np.ndarray, List[np.ndarray]],
+    title: str = 'Series',
+    x_label: str = 'x',
+    y_label: str = 'y',
+    max_points: int = None,
+    method: str = 'minmax'
+) -> None:
+    """
+    Draws one or more precomputed series onto ax, decimated to the axes' resolution.
+    """
+    ys = y if isinstance(y, (list, tuple)) else [y]
+    max_points = 2 * _pixel_width(ax) if max_points is None else max_points
+
+    for i, series in enumerate(ys):
+        ax.plot(*decimate(x, series, max_points, method), label=f'y{i}' if len(ys) > 1 else None)
+
+    ax.set_title(title)
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    ax.grid(True)
+    if len(ys) > 1:
+        ax.legend()
+
+def evaluate_grid(
+    f: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    x: np.ndarray,
+    y: np.ndarray,
+    out: np.ndarray = None,
+    tile_size: int = TILE_SIZE
+) -> np.ndarray:
+    """
+    Evaluates f(x, y) over the grid of x and y values, a band of rows at a time.
+
+    f is called with x and y arrays of the band's shape, as np.meshgrid would give
+    it, but they are broadcast views of a row of x values and a column of y values,
+    so no meshgrid is stored. The result is written straight into z, and peak
+    memory beyond z is a few bands.
+
+    Parameters:
+    - f: A vectorized function of x and y.
+    - x: The 1-D x values, along the columns of z.
+    - y: The 1-D y values, along the rows of z.
+    - out: An array of shape (len(y), len(x)) to fill, e.g. a memmap from
+      np.lib.format.open_memmap (default: None, allocate one).
+    - tile_size: About how many values of z are computed per band (default: TILE_SIZE).
+
+    Returns z, with z[i, j] = f(x[j], y[i]) as for np.meshgrid(x, y).
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    shape = (len(y), len(x))
+    z = np.empty(shape) if out is None else out
+    if z.shape != shape:
+        raise ValueError(f"out must have shape {shape}, received: {z.shape}")
+
+    rows = max(1, tile_size // max(len(x), 1))
+    for start in range(0, len(y), rows):
+        stop = min(start + rows, len(y))
+        xs, ys = np.broadcast_arrays(x[np.newaxis, :], y[start:stop, np.newaxis])
+        z[start:stop] = np.broadcast_to(f(xs, ys), xs.shape)
+
+    return z
+
+def _draw_3d_function(
+    fig: Figure,
+    f,
+    x_min=-10,
+    x_max=10,
+    y_min=-10,
+    y_max=10,
+    num_points=100,
+    render_points: int = RENDER_POINTS,
+    export_path: str = None
+) -> None:
+    """
+    Draws a 3D surface graph of f(x, y) vs x and y onto a new 3D axes of fig.
+    """
+    x = np.linspace(x_min, x_max, num_points)
+    y = np.linspace(y_min, y_max, num_points)
+
+    # draw every step-th point in each direction, which is all the surface can show,
+    # plus the last one so the surface still reaches x_max and y_max
+    step = max(1, -(-num_points // render_points))
+    drawn = np.arange(0, num_points, step)
+    if drawn[-1] != num_points - 1:
+        drawn = np.append(drawn, num_points - 1)
+
+    if export_path is not None:
+        z = evaluate_grid(f, x, y, out=np.lib.format.open_memmap(export_path, mode='w+', dtype=float, shape=(num_points, num_points)))
+        z.flush()
+        z = z[np.ix_(drawn, drawn)]
+    else:
+        z = cached_evaluate(f, ('meshgrid', x_min, x_max, y_min, y_max, num_points, step),
+                            lambda: evaluate_grid(f, x[drawn], y[drawn]))
+    x, y = np.broadcast_to(x[drawn], z.shape), np.broadcast_to(y[drawn, np.newaxis], z.shape)
+
+    # Plot the function
+    ax = fig.add_subplot(111, projection='3d')
+    ax.plot_surface(x, y, z, cmap='viridis')
+
+    ax.set_title("3D Plot of f(x, y)")
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.set_zlabel("f(x, y)")
+
+def _draw_bar_chart(
+        ax: Axes,
+        names: List[str],
+        data: List[float],
+        title: str = "Bar Chart",
+        x_label: str = "Categories",
+        y_label: str = "Values"
+    ) -> None:
+    """
+    Draws a bar chart of data against names onto ax.
+    """
+    if len(names) != len(data):
+        raise ValueError("The length of 'names' and 'data' must be the same.")
+
+    # Create the bar chart
+    ax.bar(names, data)
+
+    # Set the title and axis labels
+    ax.set_title(title)
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+
+    # Display the grid for better readability
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+def _draw_histogram(ax: Axes, data: List[float], bins: int = 10, title: str = "Histogram", x_label: str = "Values", y_label: str = "Frequency", weights: List[float] = None) -> None:
+    """
+    Draws a histogram of data onto ax.
+    """
+    # Create the histogram
+    ax.hist(data, bins=bins, weights=weights, edgecolor='white')  # edgecolor for better separation between bins
+
+    # Set the title and axis labels
+    ax.set_title(title)
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+
+    # Display the grid for better readability
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+# the plot kinds render_figure can draw and the function that draws each onto a figure
+PLOT_KINDS = {
+    '2d_function': lambda fig, **kwargs: _draw_2d_function(fig.add_subplot(), **kwargs),
+    '3d_function': _draw_3d_function,
+    'bar_chart': lambda fig, **kwargs: _draw_bar_chart(fig.add_subplot(), **kwargs),
+    'histogram': lambda fig, **kwargs: _draw_histogram(fig.add_subplot(), **kwargs),
+    'series': lambda fig, **kwargs: _draw_series(fig.add_subplot(), **kwargs),
+}
+
+def _show(fig: Figure) -> None:
+    """
+    Show a pyplot figure, then close it so it does not stay registered with pyplot.
+    """
+    plt.show()
+    plt.close(fig)
+
 def plot_2d_function(
     functions: Union[Callable[[np.ndarray], np.ndarray], List[Callable[[np.ndarray], np.ndarray]]],
     x_min: float = -10,
     x_max: float = 10,
     num_points: int = 1000,
     title: str = '2D Plot of Functions',
-    plot_theme: str = 'dark_background'
+    plot_theme: str = 'dark_background',
+    adaptive: bool = False
 ) -> None:
     """
     Plots 2D graphs of one or more functions f(x) vs x on the same plot.
@@ -22,72 +376,86 @@ def plot_2d_function(
     - functions: A single function or a list of functions to plot (each callable that takes x as input).
     - x_min: Minimum value of x (default: -10).
     - x_max: Maximum value of x (default: 10).
-    - num_points: Number of points in the graph (default: 1000).
+    - num_points: Number of points in the graph, or the point budget when adaptive (default: 1000).
     - title: Title at the top of the plot (default: '2D Plot of Functions').
     - plot_theme: Matplotlib theme to use (default: 'dark_background').
+    - adaptive: Place the points with adaptive_sample, concentrating them where the
+      curve bends, instead of spacing them evenly (default: False).
     """
-    # Ensure functions is a list even if a single function is passed
-    if not isinstance(functions, (list, tuple)):
-        functions = [functions]
-    
-    # Generate x values
-    x = np.linspace(x_min, x_max, num_points)
-
     # Set the style to the specified theme
     plt.style.use(plot_theme)
-    
+
     # Create a figure for plotting
-    plt.figure()
+    fig = plt.figure()
+    _draw_2d_function(fig.add_subplot(), functions, x_min, x_max, num_points, title, adaptive)
 
-    # Plot each function
-    for f in functions:
-        y = f(x)
-        plt.plot(x, y, label=f.__name__ if hasattr(f, '__name__') else 'f(x)')
-    
-    # Add title, labels, and grid
-    plt.title(title)
-    plt.xlabel("x")
-    plt.ylabel("f(x)")
-    plt.grid(True)
-    
-    # Add legend to distinguish between functions
-    plt.legend()
+    # Show the plot
+    _show(fig)
+
+def plot_series(
+    x: np.ndarray,
+    y: Union[np.ndarray, List[np.ndarray]],
+    title: str = 'Series',
+    x_label: str = 'x',
+    y_label: str = 'y',
+    plot_theme: str = 'dark_background',
+    max_points: int = None,
+    method: str = 'minmax'
+) -> None:
+    """
+    Plots one or more precomputed series against x as lines.
+
+    Long series are decimated before they reach matplotlib, since a line is drawn
+    no finer than the pixels of the axes.
+
+    Parameters:
+    - x: The sorted x values.
+    - y: The y values, or a list of series sharing x.
+    - title: Title at the top of the plot (default: 'Series').
+    - x_label: Label for the x-axis (default: 'x').
+    - y_label: Label for the y-axis (default: 'y').
+    - plot_theme: Matplotlib theme to use (default: 'dark_background').
+    - max_points: Points kept per series (default: None, twice the axes width in pixels).
+    - method: The decimate method, 'minmax' or 'lttb' (default: 'minmax').
+    """
+    # Set the style to the specified theme
+    plt.style.use(plot_theme)
+
+    fig = plt.figure()
+    _draw_series(fig.add_subplot(), x, y, title, x_label, y_label, max_points, method)
 
     # Show the plot
-    plt.show()
+    _show(fig)
 
 
-def plot_3d_function(f, x_min=-10, x_max=10, y_min=-10, y_max=10, num_points=100):
+def plot_3d_function(f, x_min=-10, x_max=10, y_min=-10, y_max=10, num_points=100, render_points=RENDER_POINTS, export_path=None):
     """
     Plots a 3D surface graph of f(x, y) vs x and y.
-    
+
+    f is evaluated with evaluate_grid, a band of rows at a time, and only on the
+    points that are drawn unless the full grid is exported.
+
     Parameters:
     - f: Function to plot (callable that takes x and y as input).
     - x_min: Minimum value of x (default: -10).
     - x_max: Maximum value of x (default: 10).
     - y_min: Minimum value of y (default: -10).
     - y_max: Maximum value of y (default: 10).
-    - num_points: Number of points in the graph (default: 100).
+    - num_points: Number of points in the graph along each axis (default: 100).
+    - render_points: Grids finer than this are drawn with every step-th point along
+      each axis, so at most this many (default: RENDER_POINTS).
+    - export_path: A .npy file to write the full num_points x num_points grid of
+      f(x, y) to, filled through a memmap so it never has to fit in memory
+      (default: None). Load it with np.load(export_path, mmap_mode='r').
     """
-    x = np.linspace(x_min, x_max, num_points)
-    y = np.linspace(y_min, y_max, num_points)
-    x, y = np.meshgrid(x, y)
-    z = f(x, y)
-
     # Set the style to 'dark_background'
     plt.style.use(plot_theme)
-    
+
     # Plot the function
     fig = plt.figure()
-    ax = fig.add_subplot(111, projection='3d')
-    ax.plot_surface(x, y, z, cmap='viridis')
+    _draw_3d_function(fig, f, x_min, x_max, y_min, y_max, num_points, render_points, export_path)
 
-    ax.set_title("3D Plot of f(x, y)")
-    ax.set_xlabel("x")
-    ax.set_ylabel("y")
-    ax.set_zlabel("f(x, y)")
-
-    plt.show()
+    _show(fig)
 
 def plot_bar_chart(
         names: List[str],
@@ -113,48 +481,120 @@ def plot_bar_chart(
 
     # Set the style to the specified theme
     plt.style.use(plot_theme)
-    
-    # Create the bar chart
-    plt.figure()
-    plt.bar(names, data)
 
-    # Set the title and axis labels
-    plt.title(title)
-    plt.xlabel(x_label)
-    plt.ylabel(y_label)
-    
-    # Display the grid for better readability
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    # Create the bar chart
+    fig = plt.figure()
+    _draw_bar_chart(fig.add_subplot(), names, data, title, x_label, y_label)
 
     # Show the plot
-    plt.show()
+    _show(fig)
 
-def plot_histogram(data: List[float], bins: int = 10, title: str = "Histogram", x_label: str = "Values", y_label: str = "Frequency", plot_theme: str = "dark_background") -> None:
+def plot_histogram(data: List[float], bins: int = 10, title: str = "Histogram", x_label: str = "Values", y_label: str = "Frequency", plot_theme: str = "dark_background", weights: List[float] = None) -> None:
     """
     Plots a histogram to show the distribution of the data.
 
     Parameters:
     - data: A list of numerical data points to plot in the histogram.
-    - bins: Number of bins (intervals) for the histogram (default: 10).
+    - bins: Number of bins (intervals) for the histogram, or a list of bin edges (default: 10).
     - title: Title of the histogram (default: "Histogram").
     - x_label: Label for the x-axis (default: "Values").
     - y_label: Label for the y-axis (default: "Frequency").
     - plot_theme: Matplotlib theme to use (default: 'dark_background').
+    - weights: A weight for each data point (default: None). Passing bin centers as data
+      and bin counts as weights plots precomputed counts without the raw samples.
     """
     # Set the style to the specified theme
     plt.style.use(plot_theme)
-    
-    # Create the histogram
-    plt.figure()
-    plt.hist(data, bins=bins, edgecolor='white')  # edgecolor for better separation between bins
 
-    # Set the title and axis labels
-    plt.title(title)
-    plt.xlabel(x_label)
-    plt.ylabel(y_label)
-    
-    # Display the grid for better readability
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    # Create the histogram
+    fig = plt.figure()
+    _draw_histogram(fig.add_subplot(), data, bins, title, x_label, y_label, weights)
 
     # Show the plot
-    plt.show()
\ No newline at end of file
+    _show(fig)
+
+def render_figure(kind: str, plot_theme: str = None, **kwargs) -> Figure:
+    """
+    Draws a plot onto a new Figure on the non-interactive Agg canvas, without
+    going through pyplot. The figure is never registered with pyplot, so it is
+    freed as soon as it is no longer referenced and nothing is ever shown.
+
+    Parameters:
+    - kind: The kind of plot, one of the keys of PLOT_KINDS.
+    - plot_theme: Matplotlib theme to draw with (default: None, keep the current style).
+      Pass None when rendering many figures inside a single plt.style.context.
+    - kwargs: The arguments of the matching plot_* function, e.g. functions=... for '2d_function'.
+    """
+    if kind not in PLOT_KINDS:
+        raise ValueError(f"kind must be one of {tuple(PLOT_KINDS)}, received: {kind}")
+
+    if plot_theme is not None:
+        with plt.style.context(plot_theme):
+            return render_figure(kind, **kwargs)
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    PLOT_KINDS[kind](fig, **kwargs)
+    return fig
+
+def save_figure(fig: Figure, path: str = None, format: str = 'png', close: bool = True, **savefig_kwargs) -> bytes | None:
+    """
+    Writes a figure to a file, or returns the encoded image when no path is given.
+
+    Parameters:
+    - fig: The figure to save.
+    - path: The file to write to (default: None, return the image as bytes).
+    - format: The image format, e.g. 'png' or 'svg' (default: 'png').
+    - close: Clear the figure afterwards to release its artists right away (default: True).
+    - savefig_kwargs: Extra arguments for Figure.savefig, e.g. dpi.
+    """
+    buffer = io.BytesIO() if path is None else path
+    fig.savefig(buffer, format=format, **savefig_kwargs)
+    if close:
+        fig.clear()
+
+    return buffer.getvalue() if path is None else None
+
+def _render_specs(specs: List[dict], plot_theme: str, format: str) -> List[bytes | None]:
+    """
+    Renders a list of plot specs inside one style context.
+    """
+    images = []
+    with plt.style.context(plot_theme):
+        for spec in specs:
+            spec = dict(spec)
+            path = spec.pop('path', None)
+            image_format = spec.pop('format', format)
+            fig = render_figure(spec.pop('kind'), **spec)
+            images.append(save_figure(fig, path, image_format))
+
+    return images
+
+def render_batch(specs: List[dict], workers: int = None, plot_theme: str = plot_theme, format: str = 'png') -> List[bytes | None]:
+    """
+    Renders many plots headlessly. The style is applied once per batch (once per
+    worker when a pool is used) rather than once per plot.
+
+    Parameters:
+    - specs: A list of dicts, each with a 'kind' (a key of PLOT_KINDS), the arguments
+      of the plot, and optionally a 'path' to write the image to and its own 'format'.
+    - workers: The number of worker processes (default: None, render in this process).
+      The functions in the specs must be picklable to use a pool.
+    - plot_theme: Matplotlib theme to use (default: 'dark_background').
+    - format: The image format (default: 'png').
+
+    Returns the encoded image for each spec without a path, and None for specs written to a file.
+    """
+    if workers is None or workers <= 1:
+        return _render_specs(specs, plot_theme, format)
+
+    # deal the specs out round-robin, one share per worker, so each sets up the style once
+    shares = [specs[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_render_specs, shares, [plot_theme] * workers, [format] * workers))
+
+    # undo the round-robin split so images line up with specs
+    images = [None] * len(specs)
+    for i, share in enumerate(results):
+        images[i::workers] = share
+    return images
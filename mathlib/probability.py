@@ -1,9 +1,21 @@
 # mathlib/probability.py
+import math
 import numpy as np
 from functools import partial
-from random import uniform, choices
-from math import pow
-from mathlib.plotting import plot_bar_chart, plot_2d_function
+from mathlib import combinatorics
+
+# plotting names this module used to import eagerly; they are now loaded on first
+# access so importing probability does not pull in matplotlib
+_PLOTTING_NAMES = ('plot_bar_chart', 'plot_2d_function')
+
+def __getattr__(name: str):
+    if name in _PLOTTING_NAMES:
+        from mathlib import plotting
+        return getattr(plotting, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# generator shared by the sampling functions when no rng is given
+_rng = np.random.default_rng()
 
 def normalize(data:list|tuple) -> list:
     """
@@ -15,6 +27,144 @@ def normalize(data:list|tuple) -> list:
     total = sum(data)
     return [d/total for d in data]
 
+def _get_rng(rng:np.random.Generator|int=None) -> np.random.Generator:
+    """
+    Return the module's shared generator, or a generator built from a seed.
+    """
+    return _rng if rng is None else np.random.default_rng(rng)
+
+def _alias_table(weights:np.ndarray) -> tuple:
+    """
+    Build Vose's alias table for a list of weights normalized to 1.
+
+    Returns the acceptance probability and the alias of each index. A sample is
+    a uniform index i, kept with probability prob[i] and replaced by alias[i]
+    otherwise, so it costs O(1) however many weights there are.
+    """
+    n = len(weights)
+    prob = np.asarray(weights, dtype=float) * n
+    alias = np.arange(n)
+
+    small = [i for i in range(n) if prob[i] < 1]
+    large = [i for i in range(n) if prob[i] >= 1]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        alias[s] = l
+        prob[l] += prob[s] - 1
+        (small if prob[l] < 1 else large).append(l)
+
+    # whatever is left over is 1 up to rounding
+    prob[small + large] = 1
+    return prob, alias
+
+def _die_weights(num_faces:int, weights:list|tuple|np.ndarray) -> np.ndarray|None:
+    """
+    Validate die weights and normalize them to 1. Returns None for a fair die.
+    """
+    if weights is None or len(weights) == 0:
+        return None
+    if len(weights) != num_faces:
+        raise ValueError("The length of the weights list must match the number of faces.")
+
+    weights = np.asarray(weights, dtype=float)
+    if (weights < 0).any() or not weights.sum() > 0:
+        raise ValueError("The weights must be non-negative and not all zero.")
+    return weights / weights.sum()
+
+class DiscreteSampler:
+    """
+    Sampler for a discrete distribution over a fixed set of values.
+
+    The weights are validated and turned into an alias table once, so drawing
+    from the sampler costs O(1) per sample with no per-call setup. Samplers are
+    picklable and can be shipped to worker processes; give each worker its own
+    rng so they do not draw identical streams.
+
+    Parameters
+    - weights: the weight of each value. None gives every value the same weight.
+    - values: the values to draw (default: 0, 1, ..., len(weights) - 1).
+    - rng: a numpy.random.Generator or a seed (default: the module's shared generator).
+    """
+    __slots__ = ('values', 'weights', 'rng', '_prob', '_alias')
+
+    # number of samples drawn at a time when iterating
+    block_size = 4096
+
+    def __init__(self, weights:list|tuple|np.ndarray=None, values:list|tuple|np.ndarray=None, rng:np.random.Generator|int=None):
+        # empty weights mean equal weights, as for die_roll, so the values are needed then
+        if (weights is None or len(weights) == 0) and values is None:
+            raise ValueError("Either non-empty weights or values must be given.")
+        n = len(values) if weights is None or len(weights) == 0 else len(weights)
+        if n == 0:
+            raise ValueError("There must be at least one value to sample.")
+
+        self.values = np.arange(n) if values is None else np.asarray(values)
+        self.weights = _die_weights(n, weights)
+        self.rng = _get_rng(rng)
+        if len(self.values) != n:
+            raise ValueError("The length of the weights list must match the number of values.")
+
+        # a uniform distribution needs no alias table
+        if self.weights is None:
+            self._prob, self._alias = None, None
+        else:
+            self._prob, self._alias = _alias_table(self.weights)
+
+    def sample(self, size:int|tuple=None, rng:np.random.Generator|int=None):
+        """
+        Draw one value, or an array of values if size is given.
+
+        Parameters
+        - size: the number of samples, or a shape for the array of samples (default: None).
+        - rng: a generator or seed to draw with instead of the sampler's own.
+        """
+        rng = self.rng if rng is None else np.random.default_rng(rng)
+        i = rng.integers(0, len(self.values), size)
+        if self._prob is not None:
+            i = np.where(rng.random(size) < self._prob[i], i, self._alias[i])
+
+        return self.values[i] if size is not None else self.values[i].item()
+
+    def __iter__(self):
+        """
+        Stream samples indefinitely, drawing them block_size at a time.
+        """
+        while True:
+            yield from self.sample(self.block_size).tolist()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(values={self.values.tolist()}, weights={None if self.weights is None else self.weights.tolist()})"
+
+class Die(DiscreteSampler):
+    """
+    A die with faces 1 to num_faces. If no weights are specified, the die
+    is modeled as fair.
+
+    Parameters
+    - num_faces: the number of faces on the die.
+    - weights: a list of biases or weights associated with each face of the die.
+    - rng: a numpy.random.Generator or a seed (default: the module's shared generator).
+    """
+    __slots__ = ()
+
+    def __init__(self, num_faces:int=6, weights:list|tuple|np.ndarray=None, rng:np.random.Generator|int=None):
+        super().__init__(weights, np.arange(1, num_faces + 1), rng)
+
+def die_rolls(size:int, num_faces:int=6, weights:list|tuple|np.ndarray=None, rng:np.random.Generator|int=None) -> np.ndarray:
+    """
+    Simulate size rolls of a die at once. If no weights are specified, the die
+    is modeled as fair. Weighted dice are sampled through an alias table, so each
+    roll costs O(1) however many faces there are. To roll the same weighted die
+    repeatedly, build a Die once and call its sample method instead.
+
+    Parameters
+    - size: the number of rolls, or a shape for the array of rolls.
+    - num_faces: the number of faces on the die.
+    - weights: a list of biases or weights associated with each face of the die.
+    - rng: a numpy.random.Generator or a seed (default: the module's shared generator).
+    """
+    return Die(num_faces, weights, rng).sample(size)
+
 def die_roll(num_faces:int=6, weights:list|tuple=None, plot_weights:bool=False):
     """
     Simulate the roll of a die. If no weights are specified, the die roll
@@ -24,30 +174,54 @@ def die_roll(num_faces:int=6, weights:list|tuple=None, plot_weights:bool=False):
     - num_faces: the number of faces on the die.
     - weights: a list of biases or weights associated with each face of the die.
     """
+    return int(die_rolls(1, num_faces, weights)[0])
 
-    # generate a list of die faces
-    faces = list(range(1, num_faces+1))
+def _pdf_buffer(out:np.ndarray, *args) -> np.ndarray:
+    """
+    Return out, or a new float array with the broadcast shape of args. The pdfs
+    compute in place in this buffer so they allocate at most one array.
+    """
+    if out is not None:
+        return out
+    return np.empty(np.broadcast_shapes(*(np.shape(a) for a in args)))
 
-    # make sure there is a list of weights normalized to 1
-    if not weights:
-        weights = normalize([1]*num_faces)
-    elif not sum(weights) == 1:
-        weights = normalize(weights)
-    elif len(weights) != num_faces:
-        raise ValueError("The length of the weights list must match the number of faces.")
-    
-    return choices(faces, weights)[0]
+def _pdf_output(values:np.ndarray, out:np.ndarray) -> float|np.ndarray:
+    """
+    Return the out buffer if one was given, otherwise a float for scalar
+    inputs and an ndarray for array inputs.
+    """
+    return out if out is not None else _as_output(values)
 
-def normal_pdf(x:float, mean:float=0, sigma:float=1) -> float:
+def normal_pdf(x:float|np.ndarray, mean:float|np.ndarray=0, sigma:float|np.ndarray=1, out:np.ndarray=None) -> float|np.ndarray:
     """
     The Normal/Gaussian/Bell curve probability distribution function.
+    x, mean and sigma broadcast against each other.
 
     Parameters:
     - x: the dependent variable.
     - mean: mu, the mean of the probability distribution.
     - sigma: the standard deviation from the mean.
+    - out: array to write the result into instead of allocating a new one.
+    """
+    y = _pdf_buffer(out, x, mean, sigma)
+    np.subtract(x, mean, out=y)
+    np.divide(y, sigma, out=y)
+    np.square(y, out=y)
+    np.multiply(y, -0.5, out=y)
+    np.exp(y, out=y)
+    np.divide(y, np.multiply(np.sqrt(2 * np.pi), sigma), out=y)
+    return _pdf_output(y, out)
+
+def coin_tosses(size:int, bias:float=0.5, rng:np.random.Generator|int=None) -> np.ndarray:
+    """
+    Simulate size coin tosses at once.
+
+    Parameters:
+    - size: the number of tosses, or a shape for the array of tosses.
+    - bias: the bias from 0 to 1 of flipping a Heads
+    - rng: a numpy.random.Generator or a seed (default: the module's shared generator).
     """
-    return 1/np.sqrt(2 * np.pi * sigma**2) * np.exp(-(x-mean)**2/(2*sigma**2))
+    return np.where(_get_rng(rng).random(size) < bias, 'H', 'T')
 
 def coin_toss(bias=0.5) -> chr:
     """
@@ -56,25 +230,13 @@ def coin_toss(bias=0.5) -> chr:
     Parameters:
     - bias: the bias from 0 to 1 of flipping a Heads
     """
-
-    # generate a random coin toss
-    if uniform(0,1) < bias:
-        return 'H'
-    else:
-        return 'T'
+    return str(coin_tosses(1, bias)[0])
     
 def fact(n: int) -> int:
     """
     Performs a factorial operation, n!
     """
-    if n < 0:
-        raise ValueError("n cannot be negative in n! operation.")
-    
-    running_prod = 1
-    for i in range(1, n + 1):
-        running_prod *= i
-    
-    return running_prod
+    return combinatorics.factorial(n)
 
 def n_choose_k(n: int, k: int) -> int:
     """
@@ -84,7 +246,47 @@ def n_choose_k(n: int, k: int) -> int:
     - n: total number of elements to choose from in a set
     - k: number of elements chosen - number of elements in a subset
     """
-    return fact(n) // (fact(k) * fact(n - k))
+    return combinatorics.n_choose_k(n, k)
+
+def pascals_triangle_rows(n: int = None, m: int = None):
+    """
+    Lazily generate the rows of Pascal's triangle, building each row from
+    the previous one by addition.
+
+    Parameters
+    - n: number of rows to generate (default: None, generate indefinitely).
+    - m: modulus to reduce every entry by (default: None).
+    """
+    if m is not None and m < 1:
+        raise ValueError("m must be a positive integer.")
+
+    row = [1 % m if m else 1]
+    i = 0
+    while n is None or i < n:
+        yield row
+        sums = [a + b for a, b in zip(row, row[1:])]
+        row = [row[0]] + ([s % m for s in sums] if m else sums) + [row[0]]
+        i += 1
+
+def pascals_triangle_row(n: int, m: int = None) -> list:
+    """
+    Return row n of Pascal's triangle directly, without building the rows above it.
+    Each entry follows from the one before it as C(n, k+1) = C(n, k) * (n-k) / (k+1).
+
+    Parameters
+    - n: index of the row, starting from 0.
+    - m: modulus to reduce every entry by (default: None).
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer.")
+    if m is not None and m < 1:
+        raise ValueError("m must be a positive integer.")
+
+    row = [1]
+    for k in range(n):
+        row.append(row[-1] * (n - k) // (k + 1))
+
+    return [c % m for c in row] if m else row
 
 def pascals_triangle(n: int) -> list:
     """
@@ -93,49 +295,95 @@ def pascals_triangle(n: int) -> list:
     Parameters
     - n: number of rows to generate.
     """
-    triangle = []
-    for i in range(0, n):
-        triangle.append([n_choose_k(i, k) for k in range(0, i + 1)])
-    
-    return triangle
+    return list(pascals_triangle_rows(n))
 
-def print_pascals_triangle(n: int) -> None:
+def print_pascals_triangle(n: int, file=None) -> None:
     """
-    Print out Pascal's triangle to a desired number of rows.
+    Print out Pascal's triangle to a desired number of rows. Rows are
+    written one at a time, so the whole triangle is never held in memory.
 
     Parameters
     - n: number of rows in the triangle to print.
+    - file: file-like object to write to (default: sys.stdout).
     """
-    # generate triangle
-    triangle = pascals_triangle(n)
+    if n < 1:
+        return
 
     # Find the width of the longest row when converted to string
-    longest_row = triangle[-1]
+    longest_row = pascals_triangle_row(n - 1)
     max_width = len(' '.join(map(str, longest_row)))
 
     # Print each row, centered to match the width of the longest row
-    for row in triangle:
+    for row in pascals_triangle_rows(n):
         row_str = ' '.join(map(str, row))
-        print(row_str.center(max_width))
+        print(row_str.center(max_width), file=file)
 
-def binomial_pmf(n:int, k:int, p:float) -> float:
+def _xlogy(x, y):
     """
-    The probability that an event with probability p
-    occurs k times over n trials.
+    x * log(y), taken to be 0 wherever x is 0 so that 0 * log(0) does not give nan.
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(x == 0, 0.0, x * np.log(y))
+
+def _whole_numbers(k) -> tuple:
+    """
+    Return k as an int64 array and a mask of the entries that are whole numbers.
+    The pmfs are 0 at the other entries, rather than at k cast down to an integer.
+    """
+    k = np.asarray(k)
+    if k.dtype.kind in 'biu':
+        return k.astype(np.int64), np.ones(k.shape, dtype=bool)
+
+    k = np.asarray(k, dtype=float)
+    whole = np.isfinite(k) & (k == np.floor(k))
+    return np.where(whole, k, 0).astype(np.int64), whole
+
+def _as_output(values: np.ndarray) -> float|np.ndarray:
+    """
+    Return a float for 0-d results so that scalar inputs give scalar outputs.
+    """
+    return float(values) if np.ndim(values) == 0 else values
+
+def binomial_logpmf(n:int|np.ndarray, k:int|np.ndarray, p:float|np.ndarray) -> float|np.ndarray:
+    """
+    The log of the binomial pmf, computed from log-factorials so it stays
+    finite for any n. n, k and p broadcast against each other, and k that are
+    not whole numbers lie outside the support.
 
     Parameters
     - n: total number of trials
     - k: number of expected occurrences
     - p: probability of the event
     """
-    if not n > 0:
-        assert ValueError("n must be a positive integer")
-    if not k > 0 and not k <= n:
-        assert ValueError("k must be positive and less than or equal to n")
-    if not p < 1 and p > 0:
-        assert ValueError("p must be in the range (0,1).")
+    n, n_whole = _whole_numbers(n)
+    k, k_whole = _whole_numbers(k)
+    n, k, k_whole, p = np.broadcast_arrays(n, k, k_whole, np.asarray(p, dtype=float))
+    if (n < 0).any() or not n_whole.all():
+        raise ValueError("n must be a non-negative integer")
+    if ((p < 0) | (p > 1)).any():
+        raise ValueError("p must be in the range [0,1].")
 
-    return n_choose_k(n, k) * pow(p,k) * pow(1-p,n-k)
+    # evaluate inside the support and mask everything else to log(0)
+    in_support = k_whole & (k >= 0) & (k <= n)
+    kk = np.where(in_support, k, 0)
+    log_coefficient = combinatorics.log_factorial(n) - combinatorics.log_factorial(kk) - combinatorics.log_factorial(n - kk)
+    logpmf = log_coefficient + _xlogy(kk, p) + _xlogy(n - kk, 1 - p)
+
+    return _as_output(np.where(in_support, logpmf, -np.inf))
+
+def binomial_pmf(n:int|np.ndarray, k:int|np.ndarray, p:float|np.ndarray) -> float|np.ndarray:
+    """
+    The probability that an event with probability p
+    occurs k times over n trials. n, k and p may be arrays
+    and broadcast against each other.
+
+    Parameters
+    - n: total number of trials
+    - k: number of expected occurrences
+    - p: probability of the event
+    """
+    return _as_output(np.exp(binomial_logpmf(n, k, p)))
 
 def plot_binomial_pmf(n: int, p: float) -> None:
     """
@@ -145,55 +393,95 @@ def plot_binomial_pmf(n: int, p: float) -> None:
     - n: total number of trials
     - p: probability of success
     """
+    from mathlib.plotting import plot_bar_chart
     
     # Generate all k values from 0 to n
-    k_values = list(range(0, n + 1))
+    k_values = np.arange(0, n + 1)
     
-    # Calculate the PMF for each k
-    pmf_values = [binomial_pmf(n, k, p) for k in k_values]
+    # Calculate the PMF for every k at once
+    pmf_values = binomial_pmf(n, k_values, p)
 
     plot_bar_chart(k_values, pmf_values, "Binomial pmf", "Event", "Probability")
 
-def geometric_pmf(k:int, p:float) -> float:
+def geometric_logpmf(k:int|np.ndarray, p:float|np.ndarray) -> float|np.ndarray:
     """
-    The probability that an event with probability p will occur
-    on the kth trial.
+    The log of the geometric pmf. k and p broadcast against each other, and k
+    that are not whole numbers lie outside the support.
 
     Parameters
     - k: number of trials
     - p: probability of the event
     """
-    if not p < 1 and not p > 0:
-        assert ValueError("p must be in the range (0,1).")
+    k, k_whole = _whole_numbers(k)
+    k, k_whole, p = np.broadcast_arrays(k, k_whole, np.asarray(p, dtype=float))
+    if ((p <= 0) | (p > 1)).any():
+        raise ValueError("p must be in the range (0,1].")
+
+    in_support = k_whole & (k >= 1)
+    logpmf = _xlogy(np.where(in_support, k - 1, 0), 1 - p) + np.log(p)
 
-    return pow(1-p,k-1) * p
+    return _as_output(np.where(in_support, logpmf, -np.inf))
+
+def geometric_pmf(k:int|np.ndarray, p:float|np.ndarray) -> float|np.ndarray:
+    """
+    The probability that an event with probability p will occur
+    on the kth trial. k and p may be arrays and broadcast against each other.
+
+    Parameters
+    - k: number of trials
+    - p: probability of the event
+    """
+    return _as_output(np.exp(geometric_logpmf(k, p)))
 
 def plot_geometric_pmf(k_max: int, p:float) -> None:
     """
-    Plots the geometric PMF for all k from 0 to k_max.
+    Plots the geometric PMF for all k from 1 to k_max.
 
     Parameters
     - k_max: maximum number of k to plot
     - p: probability of the event
     """
+    from mathlib.plotting import plot_bar_chart
     
-    # Generate all k values from 0 to n
-    k_values = list(range(1, k_max + 1))
+    # Generate all k values from 1 to k_max
+    k_values = np.arange(1, k_max + 1)
     
-    # Calculate the PMF for each k
-    pmf_values = [geometric_pmf(k, p) for k in k_values]
+    # Calculate the PMF for every k at once
+    pmf_values = geometric_pmf(k_values, p)
 
     plot_bar_chart(k_values, pmf_values, "Geometric pmf", "Event", "Probability")
 
-def poisson_pmf(k:int, l:float) -> float:
+def poisson_logpmf(k:int|np.ndarray, l:float|np.ndarray) -> float|np.ndarray:
+    """
+    The log of the Poisson pmf, computed from log-factorials so it stays
+    finite for any k. k and l broadcast against each other, and k that are
+    not whole numbers lie outside the support.
+
+    Parameters
+    - k: number of trials
+    - l: lambda or rate parameter in (0, infinity)
+    """
+    k, k_whole = _whole_numbers(k)
+    k, k_whole, l = np.broadcast_arrays(k, k_whole, np.asarray(l, dtype=float))
+    if not (l > 0).all():
+        raise ValueError("l must be in the range (0, infinity).")
+
+    in_support = k_whole & (k >= 0)
+    kk = np.where(in_support, k, 0)
+    logpmf = _xlogy(kk, l) - l - combinatorics.log_factorial(kk)
+
+    return _as_output(np.where(in_support, logpmf, -np.inf))
+
+def poisson_pmf(k:int|np.ndarray, l:float|np.ndarray) -> float|np.ndarray:
     """
-    The Poisson pmf related to queuing theory.
+    The Poisson pmf related to queuing theory. k and l may be arrays
+    and broadcast against each other.
 
     Parameters
     - k: number of trials
     - l: lambda or rate parameter in (0, infinity)
     """
-    return pow(l,k)*np.exp(-l) / fact(k)
+    return _as_output(np.exp(poisson_logpmf(k, l)))
 
 def plot_poisson_pmf(k_max: int, l:float) -> None:
     """
@@ -203,31 +491,128 @@ def plot_poisson_pmf(k_max: int, l:float) -> None:
     - k_max: maximum number of k to plot
     - l: lambda or rate parameter in (0,infinity)
     """
+    from mathlib.plotting import plot_bar_chart
     
-    # Generate all k values from 0 to n
-    k_values = list(range(1, k_max + 1))
+    # Generate all k values from 0 to k_max
+    k_values = np.arange(0, k_max + 1)
     
-    # Calculate the PMF for each k
-    pmf_values = [poisson_pmf(k, l) for k in k_values]
+    # Calculate the PMF for every k at once
+    pmf_values = poisson_pmf(k_values, l)
 
     plot_bar_chart(k_values, pmf_values, "Poisson pmf", "Event", "Probability")
 
-def uniform_pdf(r:float|list, a:float, b:float) -> float:
+# pmfs shorter than this are convolved directly, which is exact and faster than an FFT
+FFT_MIN_SIZE = 64
+
+def _convolve(a:np.ndarray, b:np.ndarray) -> np.ndarray:
+    """
+    The pmf of the sum of independent draws from the pmfs a and b.
+    """
+    if min(len(a), len(b)) < FFT_MIN_SIZE:
+        return np.convolve(a, b)
+
+    size = len(a) + len(b) - 1
+    fft_size = 1 << (size - 1).bit_length()
+    result = np.fft.irfft(np.fft.rfft(a, fft_size) * np.fft.rfft(b, fft_size), fft_size)[:size]
+    # round-off leaves tiny negative values where the probability is 0
+    return np.maximum(result, 0, out=result)
+
+def sum_pmf(pmf:list|tuple|np.ndarray, n:int, start:int=0) -> tuple:
+    """
+    The exact distribution of the sum of n independent draws from a discrete
+    distribution on consecutive integers.
+
+    The n-fold convolution is built by exponentiation by squaring, with FFT
+    convolutions once the pmfs are long, so it takes O(log n) convolutions and
+    O(M log M) time for a result of M values. FFT round-off leaves an absolute
+    error of about 1e-16 in each probability, so use logpmfs rather than this
+    for tail probabilities far below that.
+
+    Parameters
+    - pmf: the probabilities (or unnormalized weights) of start, start+1, ...,
+      e.g. die weights or binomial_pmf(n, np.arange(n + 1), p)
+    - n: the number of draws
+    - start: the value the first entry of pmf is the probability of (default: 0)
+
+    Returns the possible sums and their probabilities, which plot_bar_chart can render.
+    """
+    pmf = np.asarray(pmf, dtype=float)
+    if pmf.ndim != 1 or (pmf < 0).any() or not pmf.sum() > 0:
+        raise ValueError("pmf must be a 1-D array of non-negative weights that are not all zero.")
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+
+    # drop the zero-probability ends so the convolutions stay as short as possible
+    support = np.flatnonzero(pmf)
+    start += int(support[0])
+    pmf = pmf[support[0]:support[-1] + 1] / pmf.sum()
+
+    # multiply in pmf^(2^i) for every set bit i of n
+    result, power, bits = np.ones(1), pmf, n
+    while bits:
+        if bits & 1:
+            result = _convolve(result, power)
+        bits >>= 1
+        if bits:
+            power = _convolve(power, power)
+
+    return n * start + np.arange(len(result)), result
+
+def dice_sum_pmf(n:int, num_faces:int=6, weights:list|tuple|np.ndarray=None) -> tuple:
+    """
+    The exact distribution of the total of n rolls of a die, computed with sum_pmf.
+    If no weights are specified, the die is modeled as fair.
+
+    Parameters
+    - n: the number of rolls
+    - num_faces: the number of faces on the die.
+    - weights: a list of biases or weights associated with each face of the die.
+
+    Returns the possible totals, n to n * num_faces, and their probabilities.
+    """
+    weights = _die_weights(num_faces, weights)
+    return sum_pmf(np.ones(num_faces) if weights is None else weights, n, start=1)
+
+def plot_dice_sum_pmf(n:int, num_faces:int=6, weights:list|tuple|np.ndarray=None) -> None:
+    """
+    Plots the pmf of the total of n rolls of a die.
+
+    Parameters
+    - n: the number of rolls
+    - num_faces: the number of faces on the die.
+    - weights: a list of biases or weights associated with each face of the die.
+    """
+    from mathlib.plotting import plot_bar_chart
+
+    totals, pmf_values = dice_sum_pmf(n, num_faces, weights)
+    plot_bar_chart(totals, pmf_values, f"Sum of {n} dice pmf", "Total", "Probability")
+
+def uniform_pdf(r:float|np.ndarray, a:float|np.ndarray, b:float|np.ndarray, out:np.ndarray=None) -> float|np.ndarray:
     """
     Returns the value of f(r) in a uniform p.d.f. If a <= r <= b, the value
     1/(b-a) (a constant) is returned. Otherwise 0 is returned.
+    r, a and b broadcast against each other.
 
     Parameters
     - r: dependent varaible
     - a: lower limit of the pdf
     - b: upper limit of the pdf
-    """
-    
-    # calculate the uniform pdf
-    if not isinstance(r, (list, tuple, np.ndarray)):
-        return 1/(b-a) if r >= a and r <= b else 0
-    else:
-        return [1/(b-a) if i >= a and i <= b else 0 for i in r]
+    - out: array to write the result into instead of allocating a new one.
+    """
+    if not np.all(np.greater(b, a)):
+        raise ValueError("b must be greater than a.")
+    y = _pdf_buffer(out, r, a, b)
+
+    # build the mask in one buffer before writing y, as out may be r, a or b;
+    # r <= b is only tested where r >= a, leaving the other entries False
+    mask = np.greater_equal(r, a, out=np.empty(np.shape(y), dtype=bool))
+    np.less_equal(r, b, out=mask, where=mask)
+
+    # calculate the uniform pdf as a masked constant
+    np.subtract(b, a, out=y)
+    np.divide(1, y, out=y)
+    np.multiply(y, mask, out=y)
+    return _pdf_output(y, out)
     
 def plot_uniform_pdf(a:float,
                      b:float,
@@ -245,18 +630,26 @@ def plot_uniform_pdf(a:float,
     - x_max: max value to plot on the x-axis
     - num_points: number of points to calculate and plot
     """
+    from mathlib.plotting import plot_2d_function
+
     uniform_pdf_func = partial(uniform_pdf, a=a, b=b)
     plot_2d_function(uniform_pdf_func, x_min, x_max, num_points, 'Uniform p.d.f.')
 
-def exp_pdf(r:float|list, rate:float) -> float|list:
+def exp_pdf(r:float|np.ndarray, rate:float|np.ndarray, out:np.ndarray=None) -> float|np.ndarray:
     """
-    Calculates the Exponential p.d.f.
+    Calculates the Exponential p.d.f. r and rate broadcast against each other.
 
     Parameters:
     - r: the independent variable
     - rate: lambda parameter of the exponential pdf
+    - out: array to write the result into instead of allocating a new one.
     """
-    return rate * np.exp(-rate * r)
+    y = _pdf_buffer(out, r, rate)
+    np.multiply(r, rate, out=y)
+    np.negative(y, out=y)
+    np.exp(y, out=y)
+    np.multiply(y, rate, out=y)
+    return _pdf_output(y, out)
 
 def plot_exp_pdf(rate:float,
                  x_min:float=0,
@@ -272,19 +665,28 @@ def plot_exp_pdf(rate:float,
     - x_max: max value to plot on the x-axis
     - num_points: number of points to calculate and plot
     """
+    from mathlib.plotting import plot_2d_function
+
     exp_pdf_func = partial(exp_pdf, rate=rate)
     exp_pdf_func.__name__ = f"$\lambda={rate}$"
     plot_2d_function(exp_pdf_func, x_min, x_max, num_points, 'Exponential p.d.f.')
 
-def doubly_exp_pdf(r:float|list, rate:float) -> float|list:
+def doubly_exp_pdf(r:float|np.ndarray, rate:float|np.ndarray, out:np.ndarray=None) -> float|np.ndarray:
     """
-    Calculates the Doubly Exponential p.d.f.
+    Calculates the Doubly Exponential p.d.f. r and rate broadcast against each other.
 
     Parameters:
     - r: the independent variable
     - rate: lambda parameter of the doubly exponential pdf
+    - out: array to write the result into instead of allocating a new one.
     """
-    return rate/2 * np.exp(-rate * abs(r))
+    y = _pdf_buffer(out, r, rate)
+    np.multiply(r, rate, out=y)
+    np.abs(y, out=y)
+    np.negative(y, out=y)
+    np.exp(y, out=y)
+    np.multiply(y, np.divide(rate, 2), out=y)
+    return _pdf_output(y, out)
 
 def plot_doubly_exp_pdf(rate:float,
                         x_min:float=-5,
@@ -300,6 +702,279 @@ def plot_doubly_exp_pdf(rate:float,
     - x_max: max value to plot on the x-axis
     - num_points: number of points to calculate and plot
     """
+    from mathlib.plotting import plot_2d_function
+
     exp_pdf_func = partial(doubly_exp_pdf, rate=rate)
     exp_pdf_func.__name__ = f"$\lambda={rate}$"
-    plot_2d_function(exp_pdf_func, x_min, x_max, num_points, 'Doubly Exponential p.d.f.')
\ No newline at end of file
+    plot_2d_function(exp_pdf_func, x_min, x_max, num_points, 'Doubly Exponential p.d.f.')
+
+# coefficients of Cody's rational Chebyshev approximations to erf and erfc, for
+# |x| <= 0.46875, 0.46875 < |x| <= 4 and |x| > 4 (W. J. Cody, Math. Comp. 23, 1969)
+_ERF_A = (3.16112374387056560e+00, 1.13864154151050156e+02, 3.77485237685302021e+02,
+          3.20937758913846947e+03, 1.85777706184603153e-01)
+_ERF_B = (2.36012909523441209e+01, 2.44024637934444173e+02, 1.28261652607737228e+03,
+          2.84423683343917062e+03)
+_ERF_C = (5.64188496988670089e-01, 8.88314979438837594e+00, 6.61191906371416295e+01,
+          2.98635138197400131e+02, 8.81952221241769090e+02, 1.71204761263407058e+03,
+          2.05107837782607147e+03, 1.23033935479799725e+03, 2.15311535474403846e-08)
+_ERF_D = (1.57449261107098347e+01, 1.17693950891312499e+02, 5.37181101862009858e+02,
+          1.62138957456669019e+03, 3.29079923573345963e+03, 4.36261909014324716e+03,
+          3.43936767414372164e+03, 1.23033935480374942e+03)
+_ERF_P = (3.05326634961232344e-01, 3.60344899949804439e-01, 1.25781726111229246e-01,
+          1.60837851487422766e-02, 6.58749161529837803e-04, 1.63153871373020978e-02)
+_ERF_Q = (2.56852019228982242e+00, 1.87295284992346725e+00, 5.27905102951428412e-01,
+          6.05183413124413191e-02, 2.33520497626869185e-03)
+_ERF_SMALL = 0.46875
+
+def _rational(num:tuple, den:tuple, t:np.ndarray) -> np.ndarray:
+    """
+    Evaluate Cody's rational function of t: the last numerator coefficient is
+    the leading one and the denominator is monic.
+    """
+    # Horner's rule in place, so each step allocates no new arrays
+    xnum, xden = num[-1] * t, np.array(t, dtype=float)
+    for a, b in zip(num[:len(den) - 1], den):
+        xnum += a
+        xnum *= t
+        xden += b
+        xden *= t
+    xnum += num[len(den) - 1]
+    xden += den[-1]
+    xnum /= xden
+    return xnum
+
+def _erfc(x:float|np.ndarray) -> np.ndarray:
+    """
+    Complementary error function, vectorized over numpy arrays. Cody's
+    approximations are accurate to about 1e-16 relative to erfc, out to the
+    far tails where 1 - erf(x) would lose every digit.
+    """
+    x = np.asarray(x, dtype=float)
+    # erfc underflows to 0 well before 30, and clipping keeps infinities out of the arithmetic
+    y = np.minimum(np.abs(x), 30)
+    result = np.empty_like(y)
+
+    small = y <= _ERF_SMALL
+    xs = x[small]
+    result[small] = 1 - xs * _rational(_ERF_A, _ERF_B, xs * xs)
+
+    large = ~small
+    ys = y[large]
+    with np.errstate(under='ignore'):
+        # exp(-y^2) split in two so the rounding of y^2 does not cost precision in the tail
+        y16 = np.trunc(ys * 16) / 16
+        decay = np.exp(-y16 * y16) * np.exp(-(ys - y16) * (ys + y16))
+        middle = ys <= 4
+        ys[middle] = _rational(_ERF_C, _ERF_D, ys[middle])
+        z = 1 / ys[~middle]**2
+        ys[~middle] = (1 / np.sqrt(np.pi) - z * _rational(_ERF_P, _ERF_Q, z)) / ys[~middle]
+    ys *= decay
+    result[large] = np.where(x[large] < 0, 2 - ys, ys)
+    return result if result.ndim else result[()]
+
+# coefficients of Acklam's rational approximation to the standard normal quantile
+_PPF_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+          1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_PPF_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+          6.680131188771972e+01, -1.328068155288572e+01)
+_PPF_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+          -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_PPF_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+          3.754408661907416e+00)
+_PPF_TAIL = 0.02425
+
+def _standard_normal_ppf(q:np.ndarray) -> np.ndarray:
+    """
+    Quantile of the standard normal distribution. Acklam's approximation is
+    accurate to about 1e-9 and one Halley step takes it to full precision.
+    """
+    q = np.asarray(q, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # tails, using the smaller of q and 1-q so both use the same formula
+        t = np.sqrt(-2 * np.log(np.minimum(q, 1 - q)))
+        tail = np.polyval(_PPF_C, t) / (np.polyval(_PPF_D + (1,), t))
+        tail = np.where(q < 0.5, tail, -tail)
+
+        # central region
+        r = (q - 0.5)**2
+        central = (q - 0.5) * np.polyval(_PPF_A, r) / np.polyval(_PPF_B + (1,), r)
+
+        x = np.where(np.abs(q - 0.5) <= 0.5 - _PPF_TAIL, central, tail)
+
+        # one Halley step on the error of the approximation
+        e = 0.5 * _erfc(-x / np.sqrt(2)) - q
+        u = e * np.sqrt(2 * np.pi) * np.exp(x**2 / 2)
+        x = np.where(np.isfinite(x), x - u / (1 + x * u / 2), x)
+
+    x = np.where(q == 0, -np.inf, np.where(q == 1, np.inf, x))
+    return np.where((q < 0) | (q > 1), np.nan, x)
+
+class ContinuousDistribution:
+    """
+    Base class for the continuous distributions. Subclasses precompute their
+    parameter-derived constants in __init__ and implement logpdf, cdf, sf, ppf
+    and sample; every method accepts scalars or arrays.
+    """
+    __slots__ = ()
+
+    def pdf(self, x:float|np.ndarray) -> float|np.ndarray:
+        """
+        The probability density at x.
+        """
+        return _as_output(np.exp(self.logpdf(x)))
+
+    def sample(self, size:int|tuple=None, rng:np.random.Generator|int=None) -> float|np.ndarray:
+        """
+        Draw one value, or an array of values if size is given.
+
+        Parameters
+        - size: the number of samples, or a shape for the array of samples (default: None).
+        - rng: a numpy.random.Generator or a seed (default: the module's shared generator).
+        """
+        return _as_output(self._sample(_get_rng(rng), size))
+
+    def __repr__(self) -> str:
+        params = ', '.join(f"{name}={getattr(self, name)}" for name in self._params)
+        return f"{type(self).__name__}({params})"
+
+class Normal(ContinuousDistribution):
+    """
+    The Normal/Gaussian distribution.
+
+    Parameters:
+    - mean: mu, the mean of the probability distribution.
+    - sigma: the standard deviation from the mean.
+    """
+    __slots__ = ('mean', 'sigma', '_log_norm', '_scale')
+    _params = ('mean', 'sigma')
+
+    def __init__(self, mean:float=0, sigma:float=1):
+        if not sigma > 0:
+            raise ValueError("sigma must be greater than 0.")
+        self.mean, self.sigma = mean, sigma
+        self._log_norm = -math.log(sigma) - 0.5 * math.log(2 * math.pi)
+        self._scale = 1 / (sigma * math.sqrt(2))
+
+    def logpdf(self, x:float|np.ndarray) -> float|np.ndarray:
+        z = (np.asarray(x, dtype=float) - self.mean) / self.sigma
+        return _as_output(self._log_norm - z**2 / 2)
+
+    def cdf(self, x:float|np.ndarray) -> float|np.ndarray:
+        return _as_output(0.5 * _erfc((self.mean - np.asarray(x, dtype=float)) * self._scale))
+
+    def sf(self, x:float|np.ndarray) -> float|np.ndarray:
+        return _as_output(0.5 * _erfc((np.asarray(x, dtype=float) - self.mean) * self._scale))
+
+    def ppf(self, q:float|np.ndarray) -> float|np.ndarray:
+        return _as_output(self.mean + self.sigma * _standard_normal_ppf(q))
+
+    def _sample(self, rng:np.random.Generator, size:int|tuple) -> np.ndarray:
+        return rng.normal(self.mean, self.sigma, size)
+
+class Exponential(ContinuousDistribution):
+    """
+    The Exponential distribution.
+
+    Parameters:
+    - rate: lambda parameter of the exponential pdf.
+    """
+    __slots__ = ('rate', '_log_rate')
+    _params = ('rate',)
+
+    def __init__(self, rate:float=1):
+        if not rate > 0:
+            raise ValueError("rate must be greater than 0.")
+        self.rate = rate
+        self._log_rate = math.log(rate)
+
+    def logpdf(self, x:float|np.ndarray) -> float|np.ndarray:
+        x = np.asarray(x, dtype=float)
+        return _as_output(np.where(x >= 0, self._log_rate - self.rate * x, -np.inf))
+
+    def cdf(self, x:float|np.ndarray) -> float|np.ndarray:
+        x = np.asarray(x, dtype=float)
+        return _as_output(-np.expm1(-self.rate * np.maximum(x, 0)))
+
+    def sf(self, x:float|np.ndarray) -> float|np.ndarray:
+        x = np.asarray(x, dtype=float)
+        return _as_output(np.exp(-self.rate * np.maximum(x, 0)))
+
+    def ppf(self, q:float|np.ndarray) -> float|np.ndarray:
+        q = np.asarray(q, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return _as_output(np.where((q < 0) | (q > 1), np.nan, -np.log1p(-q) / self.rate))
+
+    def _sample(self, rng:np.random.Generator, size:int|tuple) -> np.ndarray:
+        return rng.exponential(1 / self.rate, size)
+
+class Laplace(ContinuousDistribution):
+    """
+    The Laplace (doubly exponential) distribution.
+
+    Parameters:
+    - rate: lambda parameter of the doubly exponential pdf.
+    - loc: the center of the distribution (default: 0).
+    """
+    __slots__ = ('rate', 'loc', '_log_norm')
+    _params = ('rate', 'loc')
+
+    def __init__(self, rate:float=1, loc:float=0):
+        if not rate > 0:
+            raise ValueError("rate must be greater than 0.")
+        self.rate, self.loc = rate, loc
+        self._log_norm = math.log(rate / 2)
+
+    def logpdf(self, x:float|np.ndarray) -> float|np.ndarray:
+        return _as_output(self._log_norm - self.rate * np.abs(np.asarray(x, dtype=float) - self.loc))
+
+    def cdf(self, x:float|np.ndarray) -> float|np.ndarray:
+        z = self.rate * (np.asarray(x, dtype=float) - self.loc)
+        return _as_output(np.where(z < 0, 0.5 * np.exp(np.minimum(z, 0)), 1 - 0.5 * np.exp(-np.maximum(z, 0))))
+
+    def sf(self, x:float|np.ndarray) -> float|np.ndarray:
+        z = self.rate * (np.asarray(x, dtype=float) - self.loc)
+        return _as_output(np.where(z > 0, 0.5 * np.exp(-np.maximum(z, 0)), 1 - 0.5 * np.exp(np.minimum(z, 0))))
+
+    def ppf(self, q:float|np.ndarray) -> float|np.ndarray:
+        q = np.asarray(q, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.where(q < 0.5, np.log(2 * q), -np.log(2 * (1 - q))) / self.rate
+            return _as_output(np.where((q < 0) | (q > 1), np.nan, self.loc + x))
+
+    def _sample(self, rng:np.random.Generator, size:int|tuple) -> np.ndarray:
+        return rng.laplace(self.loc, 1 / self.rate, size)
+
+class Uniform(ContinuousDistribution):
+    """
+    The Uniform distribution on [a, b].
+
+    Parameters:
+    - a: lower limit of the pdf.
+    - b: upper limit of the pdf.
+    """
+    __slots__ = ('a', 'b', '_width', '_log_density')
+    _params = ('a', 'b')
+
+    def __init__(self, a:float=0, b:float=1):
+        if not b > a:
+            raise ValueError("b must be greater than a.")
+        self.a, self.b = a, b
+        self._width = b - a
+        self._log_density = -math.log(self._width)
+
+    def logpdf(self, x:float|np.ndarray) -> float|np.ndarray:
+        x = np.asarray(x, dtype=float)
+        return _as_output(np.where((x >= self.a) & (x <= self.b), self._log_density, -np.inf))
+
+    def cdf(self, x:float|np.ndarray) -> float|np.ndarray:
+        return _as_output(np.clip((np.asarray(x, dtype=float) - self.a) / self._width, 0, 1))
+
+    def sf(self, x:float|np.ndarray) -> float|np.ndarray:
+        return _as_output(np.clip((self.b - np.asarray(x, dtype=float)) / self._width, 0, 1))
+
+    def ppf(self, q:float|np.ndarray) -> float|np.ndarray:
+        q = np.asarray(q, dtype=float)
+        return _as_output(np.where((q < 0) | (q > 1), np.nan, self.a + q * self._width))
+
+    def _sample(self, rng:np.random.Generator, size:int|tuple) -> np.ndarray:
+        return rng.uniform(self.a, self.b, size)
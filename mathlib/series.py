@@ -1,5 +1,17 @@
 # mathlib/series.py
 
+import numpy as np
+from fractions import Fraction
+from functools import lru_cache
+from itertools import islice
+from math import comb, lcm
+
+# largest partial result sum_integers_batch computes in int64 before switching to Python ints
+_INT64_SAFE = 2**62
+
+# Bernoulli numbers B_0, B_1, ... computed so far, with B_1 = +1/2
+_bernoulli = [Fraction(1)]
+
 def sum_integers(N:int, m:int=1, start:int=1) -> int:
     """
     Sum integers from start to N.
@@ -20,6 +32,107 @@ def sum_integers(N:int, m:int=1, start:int=1) -> int:
     s = m * ((start-1) // m)
     return (n * (n+m))//(2*m) - (s * (s+m))//(2*m)
 
+def sum_integers_batch(N, m=1, start=1) -> np.ndarray:
+    """
+    Vectorized sum_integers over arrays of queries. N, m and start broadcast
+    against each other, and every answer is computed with the closed form.
+
+    Returns an int64 array, or an object array of exact Python ints if any
+    answer would overflow int64.
+
+    Parameters:
+    - N: the largest integer in each summation series
+    - m: multiple of integers to sum (default: 1)
+    - start: the smallest integer in each summation series (default: 1)
+    """
+    try:
+        arrays = [np.asarray(a, dtype=np.int64) for a in (N, m, start)]
+    except OverflowError:
+        # values past int64 go straight to exact Python integer arithmetic
+        arrays = [np.asarray(a, dtype=object) for a in (N, m, start)]
+    N, m, start = np.broadcast_arrays(*arrays)
+    if (m <= 0).any():
+        raise ValueError("m must be greater than 0.")
+    elif (N < 0).any():
+        raise ValueError("N must be greater than 0")
+    elif (start < 1).any():
+        raise ValueError("start must be greater than 0")
+
+    # sum of multiples of m up to N is m * k(k+1)/2 with k = N // m
+    k = N // m
+    j = np.maximum(start - 1, 0) // m
+    if N.dtype != object:
+        # both triangular terms must fit, since start may lie far beyond N
+        largest = np.maximum(k, j).astype(float)
+        if (m * (largest * (largest + 1) / 2)).max(initial=0) < _INT64_SAFE:
+            return m * (k * (k + 1) // 2 - j * (j + 1) // 2)
+
+    # fall back to exact Python integer arithmetic
+    k, j, m = k.astype(object), j.astype(object), m.astype(object)
+    return m * (k * (k + 1) // 2 - j * (j + 1) // 2)
+
+def _bernoulli_number(n:int) -> Fraction:
+    """
+    Return the Bernoulli number B_n (with B_1 = +1/2), extending the cached table as needed.
+    """
+    while len(_bernoulli) <= n:
+        k = len(_bernoulli)
+        b = 1 - sum(comb(k, i) * _bernoulli[i] / (k - i + 1) for i in range(k))
+        _bernoulli.append(b)
+
+    return _bernoulli[n]
+
+@lru_cache(maxsize=None)
+def _faulhaber_coefficients(p:int) -> tuple:
+    """
+    Return integer coefficients c_0, ..., c_p+1 and a denominator d such that
+    1^p + 2^p + ... + n^p = (c_0 + c_1 n + ... + c_p+1 n^(p+1)) / d.
+    """
+    coefficients = [Fraction(0)] * (p + 2)
+    for j in range(p + 1):
+        coefficients[p + 1 - j] = Fraction(comb(p + 1, j)) * _bernoulli_number(j) / (p + 1)
+
+    d = lcm(*(c.denominator for c in coefficients))
+    return tuple(int(c * d) for c in coefficients), d
+
+def _power_sum(n:int, p:int) -> int:
+    """
+    Return 1^p + 2^p + ... + n^p with Faulhaber's formula.
+    """
+    coefficients, d = _faulhaber_coefficients(p)
+    total = 0
+    for c in reversed(coefficients):
+        total = total * n + c
+
+    return total // d
+
+def sum_powers(N:int, p:int, m:int=1, start:int=1) -> int:
+    """
+    Sum the pth powers of integers from start to N in closed form, using
+    Faulhaber's formula with cached Bernoulli numbers.
+
+    Parameters:
+    - N: the largest integer in the summation series
+    - p: the power to raise each integer to
+    - m: multiple of integers to sum (default: 1)
+    - start: the smallest integer in the summation series (default: 1)
+    """
+    if p < 0:
+        raise ValueError("p must not be negative.")
+    elif m <= 0:
+        raise ValueError("m must be greater than 0.")
+    elif N < 0:
+        raise ValueError("N must be greater than 0")
+    elif start < 1:
+        raise ValueError("start must be greater than 0")
+
+    # (m i)^p summed over i is m^p times a power sum of consecutive integers
+    k = N // m
+    j = (start - 1) // m
+    if k <= j:
+        return 0
+    return m**p * (_power_sum(k, p) - _power_sum(j, p))
+
 def get_fibonacci(n:int=None, n_start:int=0, max:int=None) -> list:
     """Generate the fibonnaci sequence.
      
@@ -40,15 +153,69 @@ def get_fibonacci(n:int=None, n_start:int=0, max:int=None) -> list:
     if n and n_start > n:
         raise ValueError(f"n_start ({n_start}) must be greater than n ({n})")
 
+    # start directly at n_start rather than building every earlier term
+    if n:
+        return list(islice(fibonacci_sequence(n_start), n - n_start + 1))
+
     seq = [0,1]
 
-    if n:
-        for i in range(1,n):
-            seq.append(seq[i] + seq[i-1])
-    elif max:
+    if max:
         while (seq[-1] + seq[-2]) < max:
             seq.append(seq[-1] + seq[-2])
     else:
         raise ValueError(f"Did not receive a value for n or max.")
     
-    return seq[n_start:]
\ No newline at end of file
+    return seq[n_start:]
+
+def _fibonacci_pair(n:int, m:int=None) -> tuple:
+    """
+    Return (F_n, F_n+1) by fast doubling, optionally modulo m.
+
+    Uses F_2k = F_k(2F_k+1 - F_k) and F_2k+1 = F_k^2 + F_k+1^2 while
+    walking the bits of n from the most significant end.
+    """
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2*b - a)
+        d = a*a + b*b
+        a, b = (d, c + d) if bit == '1' else (c, d)
+        if m:
+            a, b = a % m, b % m
+
+    return a, b
+
+def fibonacci(n:int, m:int=None) -> int:
+    """
+    Return the nth Fibonacci number F_n, optionally modulo m, in O(log n)
+    multiplications.
+
+    Parameters:
+    - n: the index of the Fibonacci number (F_0 = 0, F_1 = 1)
+    - m: modulus to reduce the result by (default: None)
+    """
+    if not isinstance(n, int) or n < 0:
+        raise ValueError(f"n must be a non-negative integer received: {n} [{type(n)}]")
+    if m is not None and (not isinstance(m, int) or m < 1):
+        raise ValueError(f"m must be a positive integer received: {m} [{type(m)}]")
+
+    return _fibonacci_pair(n, m)[0]
+
+def fibonacci_sequence(n_start:int=0, m:int=None):
+    """
+    Lazily generate the Fibonacci sequence F_n_start, F_n_start+1, ...,
+    optionally modulo m. The first two terms are found by fast doubling, so
+    starting far into the sequence costs no more than starting at F_0.
+
+    Parameters:
+    - n_start: the index of the first term to generate (default: 0)
+    - m: modulus to reduce every term by (default: None)
+    """
+    if not isinstance(n_start, int) or n_start < 0:
+        raise ValueError(f"n_start must be a non-negative integer received: {n_start} [{type(n_start)}]")
+    if m is not None and (not isinstance(m, int) or m < 1):
+        raise ValueError(f"m must be a positive integer received: {m} [{type(m)}]")
+
+    a, b = _fibonacci_pair(n_start, m)
+    while True:
+        yield a
+        a, b = b, (a + b) % m if m else a + b
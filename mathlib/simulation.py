@@ -0,0 +1,125 @@
+# mathlib/simulation.py
+
+import time
+import numpy as np
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+# default number of trials run per chunk; each chunk gets its own random stream
+CHUNK_SIZE = 2**20
+
+@dataclass
+class SimulationResult:
+    """
+    The aggregated outcome of run_simulation.
+
+    Parameters:
+    - trials: the number of trials run.
+    - counts: the number of times each outcome occurred (empty when bins were given).
+    - histogram: the count in each bin, if bins were given.
+    - bin_edges: the bin edges the histogram was counted over.
+    - elapsed: the wall time of the run in seconds.
+    """
+    trials: int
+    counts: dict = field(default_factory=dict)
+    histogram: np.ndarray = None
+    bin_edges: np.ndarray = None
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Trials per second of wall time."""
+        return self.trials / self.elapsed if self.elapsed > 0 else float('inf')
+
+    @property
+    def frequencies(self) -> dict:
+        """The fraction of trials that gave each outcome."""
+        return {outcome: count / self.trials for outcome, count in self.counts.items()}
+
+def _run_chunk(experiment, seed: np.random.SeedSequence, size: int, bins: np.ndarray) -> Counter | np.ndarray:
+    """
+    Run one chunk of trials on its own random stream and count the outcomes.
+    """
+    outcomes = np.asarray(experiment(size, rng=np.random.default_rng(seed)))
+    if bins is not None:
+        return np.histogram(outcomes, bins)[0]
+
+    values, counts = np.unique(outcomes, return_counts=True)
+    return Counter(dict(zip(values.tolist(), counts.tolist())))
+
+def _chunk_results(experiment, seeds: list, sizes: list, bins: np.ndarray, workers: int):
+    """
+    Yield the counts of each chunk as it finishes, on a process pool if workers is given.
+    """
+    if workers is None or workers <= 1:
+        for seed, size in zip(seeds, sizes):
+            yield _run_chunk(experiment, seed, size, bins)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_chunk, experiment, seed, size, bins) for seed, size in zip(seeds, sizes)]
+        for future in as_completed(futures):
+            yield future.result()
+
+def run_simulation(
+    experiment,
+    trials: int,
+    seed: int = None,
+    workers: int = None,
+    bins: int | np.ndarray = None,
+    chunk_size: int = CHUNK_SIZE
+) -> SimulationResult:
+    """
+    Run a Monte Carlo experiment many times and aggregate the outcomes.
+
+    The trials are split into chunks of chunk_size, and chunk i always draws
+    from the ith stream spawned from SeedSequence(seed). Counts are added up as
+    chunks finish, so the result for a given seed is the same for any number of
+    workers.
+
+    Parameters:
+    - experiment: a callable experiment(size, rng=generator) returning an array of
+      size outcomes, e.g. probability.die_rolls or a functools.partial of coin_tosses.
+      It must be picklable when workers is given.
+    - trials: the total number of trials to run.
+    - seed: the root seed (default: None, fresh entropy).
+    - workers: the number of worker processes (default: None, run in this process).
+    - bins: histogram the outcomes into this many equal bins over [min, max] of the
+      first chunk, or over these bin edges, instead of counting each distinct outcome.
+      Outcomes outside the edges are not counted.
+    - chunk_size: the number of trials per chunk (default: CHUNK_SIZE).
+    """
+    if trials < 1:
+        raise ValueError("trials must be a positive integer.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    start = time.perf_counter()
+    sizes = [min(chunk_size, trials - i) for i in range(0, trials, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # turn a bin count into edges from the first chunk so every chunk uses the same
+    # bins, and count that chunk here rather than running it again
+    histogram = None
+    if bins is not None and np.ndim(bins) == 0:
+        first = np.asarray(experiment(sizes[0], rng=np.random.default_rng(seeds[0])))
+        histogram, bins = np.histogram(first, int(bins))
+        histogram = histogram.astype(np.int64)
+        seeds, sizes = seeds[1:], sizes[1:]
+    elif bins is not None:
+        histogram = np.zeros(len(bins) - 1, dtype=np.int64)
+
+    counts = Counter()
+    for chunk in _chunk_results(experiment, seeds, sizes, bins, workers):
+        if bins is None:
+            counts.update(chunk)
+        else:
+            histogram += chunk
+
+    return SimulationResult(
+        trials=trials,
+        counts=dict(sorted(counts.items())),
+        histogram=histogram,
+        bin_edges=None if bins is None else np.asarray(bins),
+        elapsed=time.perf_counter() - start)
@@ -0,0 +1,156 @@
+# mathlib/stats.py
+
+import numpy as np
+
+class StreamingStats:
+    """
+    Online summary statistics for data that arrives in chunks.
+
+    Keeps fixed-bin histogram counts, the count, mean and variance (combined
+    chunk by chunk with Chan's parallel form of Welford's algorithm), the
+    min/max, and a merging t-digest for approximate quantiles. Accumulators
+    built with the same bins can be merged, e.g. after running in separate
+    processes, so the raw samples never have to be held in memory.
+
+    Parameters:
+    - bins: the number of equal-width histogram bins, or the bin edges (default: 10).
+    - bin_range: the (min, max) covered by equal-width bins. Needed when bins is a count.
+    - compression: the t-digest compression; larger keeps more centroids and gives
+      more accurate quantiles (default: 100).
+    """
+
+    def __init__(self, bins: int | np.ndarray = 10, bin_range: tuple = None, compression: float = 100):
+        if np.ndim(bins) == 0:
+            if bin_range is None:
+                raise ValueError("bin_range is needed when bins is a number of bins.")
+            bins = np.linspace(bin_range[0], bin_range[1], int(bins) + 1)
+
+        self.bin_edges = np.asarray(bins, dtype=float)
+        self.counts = np.zeros(len(self.bin_edges) - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.compression = compression
+
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+        # t-digest centroids, sorted by mean
+        self._centroids = np.zeros(0)
+        self._weights = np.zeros(0)
+
+    @property
+    def variance(self) -> float:
+        """The population variance of the data seen so far."""
+        return self._m2 / self.count if self.count else np.nan
+
+    @property
+    def std(self) -> float:
+        """The population standard deviation of the data seen so far."""
+        return np.sqrt(self.variance)
+
+    def _combine_moments(self, count: int, mean: float, m2: float) -> None:
+        """
+        Fold another group's count, mean and sum of squared deviations into ours.
+        """
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def _compress(self, centroids: np.ndarray, weights: np.ndarray) -> None:
+        """
+        Merge centroids into the digest. Neighbouring centroids are pooled while
+        they fall in the same unit of the arcsine scale function, so the tails
+        keep small centroids and the middle gets large ones.
+        """
+        order = np.argsort(centroids, kind='stable')
+        centroids, weights = centroids[order], weights[order]
+
+        q = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = np.floor(self.compression / np.pi * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.diff(k, prepend=-np.inf))
+
+        pooled = np.add.reduceat(weights, starts)
+        self._centroids = np.add.reduceat(weights * centroids, starts) / pooled
+        self._weights = pooled
+
+    def update(self, data: np.ndarray) -> 'StreamingStats':
+        """
+        Add a chunk of samples.
+
+        Parameters:
+        - data: a NumPy array (or list) of samples.
+        """
+        data = np.asarray(data, dtype=float).ravel()
+        if not len(data):
+            return self
+
+        self.counts += np.histogram(data, self.bin_edges)[0]
+        self.underflow += int((data < self.bin_edges[0]).sum())
+        self.overflow += int((data > self.bin_edges[-1]).sum())
+
+        mean = data.mean()
+        self._combine_moments(len(data), mean, ((data - mean)**2).sum())
+        self.min = min(self.min, data.min())
+        self.max = max(self.max, data.max())
+
+        self._compress(np.concatenate((self._centroids, data)), np.concatenate((self._weights, np.ones(len(data)))))
+        return self
+
+    def merge(self, other: 'StreamingStats') -> 'StreamingStats':
+        """
+        Fold in another accumulator built with the same bins.
+
+        Parameters:
+        - other: the accumulator to merge.
+        """
+        if not np.array_equal(self.bin_edges, other.bin_edges):
+            raise ValueError("Only accumulators with the same bin edges can be merged.")
+        if not other.count:
+            return self
+
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self._combine_moments(other.count, other.mean, other._m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate((self._centroids, other._centroids)), np.concatenate((self._weights, other._weights)))
+        return self
+
+    def quantile(self, q: float | np.ndarray) -> float | np.ndarray:
+        """
+        Approximate quantiles from the t-digest.
+
+        Parameters:
+        - q: a quantile or array of quantiles in [0, 1].
+        """
+        if not self.count:
+            raise ValueError("No data has been added.")
+
+        # interpolate between centroid centers, pinned to the min and max at the ends
+        positions = (np.cumsum(self._weights) - self._weights / 2) / self.count
+        positions = np.concatenate(([0], positions, [1]))
+        values = np.concatenate(([self.min], self._centroids, [self.max]))
+        result = np.interp(q, positions, values)
+
+        return float(result) if np.ndim(result) == 0 else result
+
+    def plot(self, title: str = "Histogram", x_label: str = "Values", y_label: str = "Frequency", plot_theme: str = "dark_background") -> None:
+        """
+        Plot the bin counts through plotting.plot_histogram.
+
+        Parameters:
+        - title: Title of the histogram (default: "Histogram").
+        - x_label: Label for the x-axis (default: "Values").
+        - y_label: Label for the y-axis (default: "Frequency").
+        - plot_theme: Matplotlib theme to use (default: 'dark_background').
+        """
+        from mathlib.plotting import plot_histogram
+
+        centers = (self.bin_edges[:-1] + self.bin_edges[1:]) / 2
+        plot_histogram(centers, self.bin_edges, title, x_label, y_label, plot_theme, weights=self.counts)
@@ -0,0 +1,51 @@
+import pytest
+import json
+from mathlib.benchmark import *
+
+def test_run_benchmarks():
+    try:
+        results = run_benchmarks(['integrate', 'fibonacci'], min_time=0.001, scales=2)
+        assert(set(results['benchmarks']) == {'integrate', 'fibonacci'})
+        for result in results['benchmarks'].values():
+            assert(len(result['runs']) == 2)
+            for run in result['runs']:
+                assert(run['ops_per_sec'] == pytest.approx(1 / run['seconds']))
+                assert(run['peak_bytes'] >= 0)
+            assert(result['exponent'] > 0)
+
+        assert('integrate' in format_results(results))
+        json.dumps(results)
+    except Exception as e:
+        pytest.fail(f"Failed to run benchmarks: {e}")
+
+    with pytest.raises(ValueError):
+        run_benchmarks(['not_a_benchmark'])
+
+def test_scaling_exponent():
+    try:
+        assert(scaling_exponent([10, 100, 1000], [1, 100, 10000]) == pytest.approx(2))
+        assert(scaling_exponent([10, 100], [3, 30]) == pytest.approx(1))
+    except Exception as e:
+        pytest.fail(f"Failed scaling exponent: {e}")
+
+def test_compare(tmp_path):
+    try:
+        results = run_benchmarks(['normal_pdf'], min_time=0.001, scales=2)
+        assert(compare(results, results) == [])
+
+        # a baseline twice as fast as the current run is a 100% slowdown
+        baseline = json.loads(json.dumps(results))
+        for run in baseline['benchmarks']['normal_pdf']['runs']:
+            run['seconds'] /= 2
+        regressions = compare(results, baseline, threshold=0.5)
+        assert([r['n'] for r in regressions] == [1000, 10000])
+        assert(regressions[0]['slowdown'] == pytest.approx(1))
+        assert(compare(results, baseline, threshold=1.5) == [])
+
+        path = tmp_path / 'baseline.json'
+        path.write_text(json.dumps(baseline))
+        assert(main(['normal_pdf', '--min-time', '0.001', '--scales', '2', '--baseline', str(path), '--threshold', '0.5']) == 1)
+        assert(main(['normal_pdf', '--min-time', '0.001', '--scales', '1', '--output', str(tmp_path / 'out.json')]) == 0)
+        assert('normal_pdf' in json.loads((tmp_path / 'out.json').read_text())['benchmarks'])
+    except Exception as e:
+        pytest.fail(f"Failed benchmark comparison: {e}")
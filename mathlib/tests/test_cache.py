@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+from functools import partial
+from mathlib.cache import *
+from mathlib.calc import integrate
+from mathlib.plotting import render_figure
+from mathlib.probability import normal_pdf
+
+def test_evaluation_cache():
+    cache = EvaluationCache(max_bytes=2 * 8 * 100)
+    calls = []
+    compute = lambda: calls.append(1) or np.arange(100.0)
+
+    try:
+        values = cache.get(np.sin, ('linspace', 0, 1, 100), compute)
+        assert(cache.get(np.sin, ('linspace', 0, 1, 100), compute) is values)
+        assert(len(calls) == 1 and (cache.hits, cache.misses) == (1, 1))
+
+        # partials with equal arguments share an entry
+        cache.get(partial(normal_pdf, mean=0, sigma=1), 'grid', compute)
+        cache.get(partial(normal_pdf, mean=0, sigma=1), 'grid', compute)
+        assert(len(calls) == 2 and len(cache) == 2)
+
+        # a third entry evicts the least recently used one
+        cache.get(np.cos, 'grid', compute)
+        assert(len(cache) == 2 and cache.nbytes <= cache.max_bytes)
+        cache.get(np.sin, ('linspace', 0, 1, 100), compute)
+        assert(len(calls) == 4)
+
+        # results too large to store, or computed with caching off, stay writeable
+        assert(cache.get(np.tan, 'grid', lambda: np.zeros(1000)).flags.writeable)
+        assert(get_cache() is None and cached_evaluate(np.tan, 'grid', lambda: np.zeros(3)).flags.writeable)
+
+        cache.clear()
+        assert(cache.info() == {'hits': 0, 'misses': 0, 'entries': 0, 'nbytes': 0, 'max_bytes': 1600})
+    except Exception as e:
+        pytest.fail(f"Failed evaluation cache: {e}")
+
+    # cached arrays are shared, so they are read-only
+    with pytest.raises(ValueError):
+        values[0] = 1
+    with pytest.raises(ValueError):
+        EvaluationCache(max_bytes=-1)
+
+def test_shared_cache():
+    calls = []
+    def f(x):
+        calls.append(len(x))
+        return np.exp(-x**2)
+
+    try:
+        assert(get_cache() is None)
+        with evaluation_cache() as cache:
+            render_figure('2d_function', functions=f, x_min=0, x_max=5, num_points=1001)
+            trapezoid = integrate(f, 0, 5, 0.005, method='trapezoid')
+            simpson = integrate(f, 0, 5, 0.005, method='simpson')
+            assert(calls == [1001] and cache.hits == 2)
+        assert(get_cache() is None)
+
+        assert(trapezoid == pytest.approx(np.sqrt(np.pi) / 2))
+        assert(simpson == pytest.approx(np.sqrt(np.pi) / 2))
+        assert(integrate(f, 0, 5, 0.005, method='simpson') == simpson)
+    except Exception as e:
+        pytest.fail(f"Failed shared evaluation cache: {e}")
+
+    cache = enable_cache()
+    try:
+        calls.clear()
+        integrate(f, 0, 5, 0.005, method='riemann')
+        integrate(f, 0, 5, 0.005, method='riemann')
+        # the left sum only evaluates the points it uses
+        assert(calls == [1000] and cache.info()['hits'] == 1)
+
+        # 0.2 + (0.9 - 0.2) / 700 * 700 is not 0.9, but the grids still match
+        render_figure('2d_function', functions=f, x_min=0.2, x_max=0.9, num_points=701)
+        integrate(f, 0.2, 0.9, 0.001, method='trapezoid')
+        assert(calls == [1000, 701])
+    except Exception as e:
+        pytest.fail(f"Failed cached integration: {e}")
+    finally:
+        disable_cache()
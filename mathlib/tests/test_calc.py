@@ -1,5 +1,7 @@
 import pytest
+import math
 import numpy as np
+from functools import partial
 from mathlib.probability import normal_pdf
 from mathlib.calc import *
 
@@ -14,4 +16,85 @@ def test_normal_pdf_plot():
         assert(differ2 < 0.0000001)
 
     except Exception as e:
-        pytest.fail(f"Failed integration test: {e}.")
\ No newline at end of file
+        pytest.fail(f"Failed integration test: {e}.")
+
+def test_integrate_methods():
+    try:
+        for method in ('trapezoid', 'simpson', 'gauss'):
+            area = integrate(lambda x: np.exp(-x**2), -10, 10, 0.1, method=method)
+            assert(abs(np.sqrt(np.pi) - area) < 1e-10)
+
+        # simpson's rule is exact for cubics, and the segment count is rounded up to even
+        assert(abs(integrate(lambda x: x**3 + x, 0, 2, 0.7, method='simpson') - 6) < 1e-12)
+
+        # scalar-only functions are evaluated point by point
+        area = integrate(lambda x: 1.0 if x < 0.5 else 0.0, 0, 1, 0.001, method='trapezoid')
+        assert(abs(area - 0.5) < 1e-2)
+    except Exception as e:
+        pytest.fail(f"Failed integration test: {e}.")
+
+    with pytest.raises(ValueError):
+        integrate(np.sin, 0, 1, 0.1, method='midpoint')
+    with pytest.raises(ValueError):
+        integrate(np.sin, 0, 1, method='simpson')
+
+def test_integrate_adaptive():
+    calls = []
+    def f(x):
+        calls.append(np.size(x))
+        return np.sqrt(np.abs(x))
+
+    try:
+        area = integrate(f, -1, 1, method='adaptive', tol=1e-9)
+        assert(abs(area - 4/3) < 1e-9)
+        assert(sum(calls) < 5000)
+
+        # starting panels narrower than the peak keep it from being missed
+        area = integrate(partial(normal_pdf, sigma=0.001), -10, 10, 0.3, method='adaptive')
+        assert(abs(area - 1) < 1e-8)
+    except Exception as e:
+        pytest.fail(f"Failed adaptive integration test: {e}.")
+
+def test_integrate_parallel():
+    try:
+        for method in ('riemann', 'simpson', 'gauss', 'adaptive'):
+            serial = integrate(math.cos, 0, 1, 0.001, method=method, chunks=PARALLEL_CHUNKS)
+            assert(serial == integrate(math.cos, 0, 1, 0.001, method=method, workers=2))
+            # a single worker skips the chunking altogether
+            assert(integrate(math.cos, 0, 1, 0.001, method=method, workers=1) == integrate(math.cos, 0, 1, 0.001, method=method))
+            assert(serial == integrate(math.cos, 0, 1, 0.001, method=method, workers=3, executor='thread'))
+
+        area = integrate(math.cos, 0, 1, 0.001, method='simpson', workers=2, chunks=7)
+        assert(abs(area - math.sin(1)) < 1e-12)
+    except Exception as e:
+        pytest.fail(f"Failed parallel integration test: {e}.")
+
+    with pytest.raises(ValueError):
+        integrate(math.cos, 0, 1, 0.001, workers=2, executor='cluster')
+    with pytest.raises(ValueError):
+        integrate(math.cos, 0, 1, 0.001, workers=2, chunks=0)
+    with pytest.raises(ValueError):
+        integrate(math.cos, 0, 1, 0.001, chunks=-3)
+
+def test_integrate_nd():
+    try:
+        gaussian = lambda x, y: np.exp(-(x**2 + y**2))
+        area, error = integrate_nd(gaussian, [(-5, 5), (-5, 5)], return_error=True)
+        assert(abs(area - np.pi) < 1e-6)
+        assert(error < 1e-5)
+
+        # small batches and scalar-only functions give the same answer
+        assert(abs(integrate_nd(lambda x, y, z: x*y*z, [(0, 1)]*3, batch_size=10) - 1/8) < 1e-12)
+        assert(abs(integrate_nd(lambda x, y: math.exp(x + y), [(0, 1), (0, 1)]) - (math.e - 1)**2) < 1e-12)
+
+        # higher dimensions switch to quasi-Monte Carlo with a seeded, reproducible estimate
+        cube = lambda *x: sum(x)
+        value, error = integrate_nd(cube, [(0, 1)]*5, seed=0, return_error=True)
+        assert(abs(value - 2.5) < 1e-3)
+        assert(error < 1e-3)
+        assert(integrate_nd(cube, [(0, 1)]*5, seed=0) == value)
+    except Exception as e:
+        pytest.fail(f"Failed multidimensional integration test: {e}.")
+
+    with pytest.raises(ValueError):
+        integrate_nd(cube, [(0, 1)]*5, method='qmc', replicates=1)
@@ -0,0 +1,63 @@
+import pytest
+import math
+import numpy as np
+from collections import OrderedDict
+from mathlib import combinatorics
+from mathlib.combinatorics import *
+
+def test_factorial() -> None:
+    try:
+        for n in list(range(300)) + [5000]:
+            assert(factorial(n) == math.factorial(n))
+            assert(factorial(n, cache=False) == math.factorial(n))
+    except Exception as e:
+        pytest.fail(f"Failed factorial: {e}")
+
+    with pytest.raises(ValueError):
+        factorial(-1)
+
+def test_factorial_cache(monkeypatch) -> None:
+    monkeypatch.setattr('mathlib.combinatorics.FACTORIAL_CACHE_BITS', 2 * 10**4)
+    monkeypatch.setattr('mathlib.combinatorics._factorials', OrderedDict())
+    monkeypatch.setattr('mathlib.combinatorics._factorial_bits', 0)
+    try:
+        for n in range(100, 1100, 100):
+            assert(factorial(n) == math.factorial(n))
+        # the cache holds the latest factorials that fit its bit budget and skips larger ones
+        cached = combinatorics._factorials
+        assert(list(cached) == [900, 1000] and factorial(900) is cached[900])
+        assert(factorial(3000) == math.factorial(3000) and list(cached) == [1000, 900])
+        assert(sum(v.bit_length() for v in cached.values()) == combinatorics._factorial_bits <= 2 * 10**4)
+    except Exception as e:
+        pytest.fail(f"Failed factorial cache: {e}")
+
+def test_n_choose_k() -> None:
+    try:
+        for n in range(100):
+            assert([n_choose_k(n, k) for k in range(n + 1)] == [math.comb(n, k) for k in range(n + 1)])
+        # both the multiplicative and the prime factorization paths
+        assert(n_choose_k(100000, 7) == math.comb(100000, 7))
+        assert(n_choose_k(100000, 40000) == math.comb(100000, 40000))
+        assert(n_choose_k(10**12, 3) == math.comb(10**12, 3))
+        # prime factorization with the primes from the segmented sieve above util.SIEVE_BOUND
+        assert(n_choose_k(2 * 10**6 + 1, 5000) == math.comb(2 * 10**6 + 1, 5000))
+    except Exception as e:
+        pytest.fail(f"Failed n choose k: {e}")
+
+    for v in [(5, -1), (5, 6), (-1, 0)]:
+        with pytest.raises(ValueError):
+            n_choose_k(*v)
+
+def test_log_factorial() -> None:
+    try:
+        assert(log_factorial(0) == 0)
+        assert(abs(log_factorial(20) - math.log(math.factorial(20))) < 1e-12)
+
+        n = np.array([[0, 5], [1000, LOG_FACTORIAL_TABLE_MAX + 10]])
+        expected = [[math.lgamma(float(i) + 1) for i in row] for row in n]
+        assert(np.allclose(log_factorial(n), expected, rtol=1e-15))
+    except Exception as e:
+        pytest.fail(f"Failed log factorial: {e}")
+
+    with pytest.raises(ValueError):
+        log_factorial([1, -1])
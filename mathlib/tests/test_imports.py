@@ -0,0 +1,40 @@
+import pytest
+import os
+import subprocess
+import sys
+import mathlib
+
+def _imported_modules(statement: str) -> set:
+    # run in a fresh interpreter, since this one has imported matplotlib for the plotting tests
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(mathlib.__file__)))
+    return set(result.stdout.split())
+
+@pytest.mark.parametrize('statement', [
+    'import mathlib.probability',
+    'import mathlib.stats',
+    'import mathlib.simulation',
+    'import mathlib.calc',
+    'from mathlib import binomial_pmf, coin_toss, StreamingStats',
+])
+def test_no_matplotlib_on_import(statement):
+    try:
+        assert('matplotlib' not in _imported_modules(statement))
+    except Exception as e:
+        pytest.fail(f"Failed lazy import of {statement}: {e}")
+
+def test_lazy_exports():
+    try:
+        for module, names in mathlib._EXPORTS.items():
+            assert(getattr(mathlib, module).__name__ == f'mathlib.{module}')
+            for name in names:
+                assert(getattr(mathlib, name) is getattr(getattr(mathlib, module), name))
+
+        assert(set(mathlib.__all__) <= set(dir(mathlib)))
+        assert('matplotlib' in _imported_modules('import mathlib; mathlib.plot_histogram'))
+    except Exception as e:
+        pytest.fail(f"Failed lazy exports: {e}")
+
+    with pytest.raises(AttributeError):
+        mathlib.not_a_function
@@ -0,0 +1,117 @@
+import pytest
+import json
+import os
+import subprocess
+import sys
+import mathlib
+from mathlib import calc, series, util
+from mathlib.instrument import *
+
+def run_python(script: str, **env) -> None:
+    """
+    Run script in a fresh interpreter from the repository root, with env added to the environment.
+    """
+    subprocess.run([sys.executable, '-c', script], check=True, env=dict(os.environ, **env),
+                   cwd=os.path.dirname(os.path.dirname(mathlib.__file__)))
+
+def test_instrument():
+    fibonacci, is_prime = series.fibonacci, util.is_prime
+    try:
+        with instrument(('series', 'util', 'calc')) as profile:
+            assert(series.fibonacci is not fibonacci)
+            series.fibonacci(1000)
+            util.get_prime_factors(13195)
+            calc.integrate(lambda x: float(util.is_prime(int(x))), 0, 100, 1, vectorized=False)
+
+        # the wrappers are gone once the block ends, including in modules that imported the names
+        assert(series.fibonacci is fibonacci and util.is_prime is is_prime and calc.is_prime is is_prime)
+        assert(get_profile() is profile)
+
+        measurements = profile.to_dict()
+        assert(measurements['series.fibonacci']['calls'] == 1)
+        assert(measurements['series.fibonacci']['argument_sizes'] == {1024: 1})
+        assert(measurements['util.is_prime']['calls'] == 100)
+        assert(measurements['util.factorize']['calls'] == 1)
+        integrate = measurements['calc.integrate']
+        assert(integrate['wall_seconds'] > 0 and integrate['cpu_seconds'] >= 0)
+
+        prometheus = profile.to_prometheus()
+        assert('mathlib_calls_total{function="util.is_prime"} 100' in prometheus)
+        assert('mathlib_argument_size_bucket{function="series.fibonacci",le="+Inf"} 1' in prometheus)
+
+        stacks = dict(line.rsplit(' ', 1) for line in profile.to_folded().splitlines())
+        assert('calc.integrate;util.is_prime' in stacks)
+        assert('util.get_prime_factors;util.factorize' in stacks)
+        assert(all(int(microseconds) >= 0 for microseconds in stacks.values()))
+
+        profile.reset()
+        assert(profile.to_dict() == {} and profile.to_folded() == '')
+    except Exception as e:
+        pytest.fail(f"Failed to instrument: {e}")
+
+def test_instrument_methods(tmp_path):
+    from mathlib import probability
+
+    try:
+        with instrument(('probability',)) as profile:
+            probability.Normal(0, 1).sample(100)
+            probability.die_roll()
+        measurements = profile.to_dict()
+        assert(measurements['probability.ContinuousDistribution.sample']['calls'] == 1)
+        assert(measurements['probability.DiscreteSampler.sample']['calls'] == 1)
+
+        for name, format in (('profile.json', 'json'), ('profile.prom', 'prometheus'), ('profile.folded', 'folded')):
+            profile.write(tmp_path / name)
+            assert((tmp_path / name).read_text().strip())
+    except Exception as e:
+        pytest.fail(f"Failed to instrument methods: {e}")
+
+    with pytest.raises(ValueError):
+        profile.write(tmp_path / 'profile.json', format='csv')
+
+def test_instrument_environment(tmp_path):
+    try:
+        path = tmp_path / 'profile.prom'
+        run_python('from mathlib.series import fibonacci; fibonacci(10)',
+                   MATHLIB_INSTRUMENT='series', MATHLIB_INSTRUMENT_OUTPUT=str(path))
+        assert('mathlib_calls_total{function="series.fibonacci"} 1' in path.read_text())
+
+        # instrumenting everything loads neither plotting nor matplotlib until they are used
+        path = tmp_path / 'profile.json'
+        run_python("import sys, mathlib; assert 'mathlib.plotting' not in sys.modules and 'matplotlib' not in sys.modules; "
+                   "from mathlib.util import is_prime; is_prime(7); mathlib.integrate(lambda x: x, 0, 1, 0.5)",
+                   MATHLIB_INSTRUMENT='all', MATHLIB_INSTRUMENT_OUTPUT=str(path))
+        measurements = json.loads(path.read_text())
+        assert(measurements['util.is_prime']['calls'] == 1 and measurements['calc.integrate']['calls'] == 1)
+    except Exception as e:
+        pytest.fail(f"Failed to instrument from the environment: {e}")
+
+def test_disable_unbinds_every_wrapper():
+    try:
+        # the package caches exported names, including a wrapper handed out while instrumenting
+        vars(mathlib).pop('integrate', None)
+        with instrument(('calc',)) as profile:
+            mathlib.integrate(lambda x: x, 0, 1, 0.5)
+        assert(mathlib.integrate is calc.integrate and not hasattr(mathlib.integrate, '__wrapped__'))
+        before = profile.to_dict()
+        mathlib.integrate(lambda x: x, 0, 1, 0.5)
+        assert(profile.to_dict() == before)
+
+        # modules imported after their dependencies were instrumented bind the wrappers
+        run_python('''
+import sys
+from mathlib.instrument import enable, disable
+for lazy in (False, True):
+    for name in ('mathlib.calc', 'mathlib.util'):
+        sys.modules.pop(name, None)
+    profile = enable(('util', 'calc'), lazy=lazy)
+    import mathlib.calc as calc
+    calc.integrate(lambda x: x, 0, 2, 1)
+    disable()
+    assert not hasattr(calc.is_prime, '__wrapped__') and not hasattr(calc.integrate, '__wrapped__')
+    before = profile.to_dict()
+    calc.is_prime(7)
+    assert profile.to_dict() == before
+''')
+    except Exception as e:
+        pytest.fail(f"Failed to unbind every wrapper: {e}")
@@ -38,4 +38,131 @@ def test_3dPlot():
         plot_3d_function(lambda x, y: np.exp(-(x**2 + y**2)), x_min=-2, x_max=2, y_min=-2, y_max=2)
     except Exception as e:
         pytest.fail(f"plot_3d_function raised an exception: {e}")
-    
\ No newline at end of file
+    
+def test_histogram_weights():
+    try:
+        plot_histogram([0.5, 1.5, 2.5], bins=[0, 1, 2, 3], weights=[10, 30, 20])
+    except Exception as e:
+        pytest.fail(f"plot_histogram raised an exception: {e}")
+
+def test_render_figure():
+    try:
+        fig = render_figure('2d_function', functions=np.sin, x_min=0, x_max=2*np.pi)
+        assert(plt.get_fignums() == [])
+        assert(save_figure(fig).startswith(b'\x89PNG'))
+
+        svg = save_figure(render_figure('bar_chart', plot_theme=plot_theme, names=['a', 'b'], data=[1, 2]), format='svg')
+        assert(b'<svg' in svg)
+    except Exception as e:
+        pytest.fail(f"render_figure raised an exception: {e}")
+
+    with pytest.raises(ValueError):
+        render_figure('pie_chart')
+    with pytest.raises(ValueError):
+        render_figure('bar_chart', names=['a'], data=[1, 2])
+
+def test_render_batch(tmp_path):
+    specs = [
+        dict(kind='histogram', data=np.arange(100), bins=10),
+        dict(kind='3d_function', f=np.hypot, num_points=20),
+        dict(kind='2d_function', functions=np.sin, path=tmp_path / 'sin.png'),
+        dict(kind='bar_chart', names=['a', 'b'], data=[1, 2], format='svg'),
+    ]
+    try:
+        images = render_batch(specs)
+        assert(images[0].startswith(b'\x89PNG') and images[1].startswith(b'\x89PNG'))
+        assert(images[2] is None and (tmp_path / 'sin.png').exists())
+        assert(b'<svg' in images[3])
+
+        pooled = render_batch(specs, workers=2)
+        assert([image is None for image in pooled] == [image is None for image in images])
+        assert(b'<svg' in pooled[3])
+    except Exception as e:
+        pytest.fail(f"render_batch raised an exception: {e}")
+
+def test_adaptive_sample():
+    try:
+        # a narrow peak gets most of the points, a straight line only the starting grid
+        x, y = adaptive_sample(lambda x: np.exp(-x**2 / 0.01), -10, 10, num_points=500)
+        assert(len(x) <= 500 and np.all(np.diff(x) > 0))
+        assert(np.sum(np.abs(x) < 1) > len(x) / 2)
+        assert(np.allclose(y, np.exp(-x**2 / 0.01)))
+
+        x, y = adaptive_sample(lambda x: 2 * x + 1, -10, 10, num_points=500, initial_points=20)
+        assert(len(x) == 20)
+
+        plot_2d_function(np.tan, x_min=-5, x_max=5, adaptive=True)
+    except Exception as e:
+        pytest.fail(f"Failed adaptive sampling: {e}")
+
+    with pytest.raises(ValueError):
+        adaptive_sample(np.sin, 0, 1, num_points=1)
+
+def test_decimate():
+    x = np.linspace(0, 1, 100_000)
+    y = np.sin(50 * x)
+    y[12_345] = 10
+
+    try:
+        for method in ('minmax', 'lttb'):
+            x_kept, y_kept = decimate(x, y, 1000, method)
+            assert(len(x_kept) <= 1002 and np.all(np.diff(x_kept) > 0))
+            assert(x_kept[0] == 0 and x_kept[-1] == 1)
+            assert(y_kept.max() == 10)
+
+        x_kept, y_kept = decimate(x[:10], y[:10], 1000)
+        assert(len(x_kept) == 10)
+    except Exception as e:
+        pytest.fail(f"Failed decimation: {e}")
+
+    with pytest.raises(ValueError):
+        decimate(x, y[:-1], 1000)
+    with pytest.raises(ValueError):
+        decimate(x, y, 1000, method='average')
+
+def test_plot_series():
+    try:
+        x = np.linspace(0, 10, 10**6)
+        plot_series(x, [np.sin(x), np.cos(x)])
+        plot_series(x, np.sin(x), method='lttb')
+    except Exception as e:
+        pytest.fail(f"plot_series raised an exception: {e}")
+
+def test_evaluate_grid():
+    f = lambda x, y: np.sin(x) * np.cos(y)
+    x, y = np.linspace(-2, 2, 300), np.linspace(0, 1, 70)
+    X, Y = np.meshgrid(x, y)
+
+    try:
+        # bands smaller than a row, a few rows and the whole grid all give the meshgrid result
+        for tile_size in (1, 1000, 10**6):
+            assert(np.array_equal(evaluate_grid(f, x, y, tile_size=tile_size), f(X, Y)))
+        assert(np.all(evaluate_grid(lambda x, y: 1.0, x, y) == 1))
+
+        # f gets x and y with the band's full shape, as from np.meshgrid
+        assert(np.array_equal(evaluate_grid(lambda x, y: np.stack([x, y])[0], x, y, tile_size=1000), X))
+    except Exception as e:
+        pytest.fail(f"Failed grid evaluation: {e}")
+
+    with pytest.raises(ValueError):
+        evaluate_grid(f, x, y, out=np.empty((300, 70)))
+
+def test_3d_export(tmp_path):
+    path = tmp_path / 'z.npy'
+    seen = []
+    def f(x, y):
+        seen.append((x.max(), y.max()))
+        return np.hypot(x, y)
+
+    try:
+        plot_3d_function(np.hypot, x_min=-1, x_max=1, y_min=-1, y_max=1, num_points=1200, render_points=100, export_path=path)
+        z = np.load(path, mmap_mode='r')
+        x = np.linspace(-1, 1, 1200)
+        assert(z.shape == (1200, 1200))
+        assert(np.array_equal(z[::97], np.hypot(x, x[::97, np.newaxis])))
+
+        # 1200 points drawn every 12th does not land on the last one, which is drawn anyway
+        plot_3d_function(f, x_min=-1, x_max=1, y_min=-1, y_max=2, num_points=1200, render_points=100)
+        assert(max(seen) == (1, 2))
+    except Exception as e:
+        pytest.fail(f"plot_3d_function raised an exception: {e}")
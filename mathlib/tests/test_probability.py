@@ -1,7 +1,12 @@
 import pytest
+import io
+import math
+import pickle
+import numpy as np
 from mathlib.plotting import plot_2d_function
 from mathlib.probability import *
 from functools import partial
+from itertools import islice
 from icecream import ic
 
 def test_normal_pdf_plot():
@@ -57,43 +62,310 @@ def test_die_roll():
     except Exception as e:
         pytest.fail(f"Failed to roll die: {e}")
 
+def test_coin_tosses():
+    try:
+        assert((coin_tosses(100, 1) == 'H').all())
+        assert((coin_tosses(100, 0) == 'T').all())
+        assert(coin_tosses((4, 5)).shape == (4, 5))
+
+        # the same seed gives the same tosses
+        assert((coin_tosses(1000, rng=7) == coin_tosses(1000, rng=7)).all())
+        assert(abs((coin_tosses(100000, 0.3, rng=1) == 'H').mean() - 0.3) < 0.01)
+    except Exception as e:
+        pytest.fail(f"Failed to toss coins: {e}")
+
+def test_die_rolls():
+    try:
+        rolls = die_rolls(10000, rng=0)
+        assert(rolls.min() == 1 and rolls.max() == 6)
+        assert((die_rolls(1000, 6, [0, 0, 1, 0, 0, 0]) == 3).all())
+
+        weights = np.array([1, 2, 3, 0, 0, 4])
+        counts = np.bincount(die_rolls(200000, 6, weights, rng=1), minlength=7)[1:]
+        assert(np.abs(counts / 200000 - weights / weights.sum()).max() < 0.01)
+        assert((die_rolls(1000, 6, weights, rng=5) == die_rolls(1000, 6, weights, rng=5)).all())
+    except Exception as e:
+        pytest.fail(f"Failed to roll dice: {e}")
+
+    with pytest.raises(ValueError):
+        die_rolls(10, 6, [1, 2, 3])
+    with pytest.raises(ValueError):
+        die_rolls(10, 3, [1, -1, 1])
+
+def test_discrete_sampler():
+    try:
+        sampler = DiscreteSampler([1, 0, 3], values=['a', 'b', 'c'], rng=0)
+        draws = sampler.sample(100000)
+        assert(set(draws.tolist()) == {'a', 'c'})
+        assert(abs((draws == 'c').mean() - 0.75) < 0.01)
+        assert(sampler.sample() in ('a', 'c'))
+        assert(len(list(islice(sampler, 10000))) == 10000)
+
+        # a pickled sampler carries its table and generator state with it
+        die = Die(6, [0, 1, 0, 0, 0, 1], rng=3)
+        copy = pickle.loads(pickle.dumps(die))
+        assert((copy.sample(1000) == die.sample(1000)).all())
+        assert(set(die.sample(1000).tolist()) == {2, 6})
+        assert(Die(4).sample((2, 3)).shape == (2, 3))
+    except Exception as e:
+        pytest.fail(f"Failed discrete sampler: {e}")
+
+    with pytest.raises(AttributeError):
+        Die().faces = 6
+    with pytest.raises(ValueError):
+        DiscreteSampler([1, 2], values=[1, 2, 3])
+    with pytest.raises(ValueError):
+        DiscreteSampler(weights=[])
+    with pytest.raises(ValueError):
+        DiscreteSampler(values=[])
+
 def test_fact() -> int:
-    #TODO
-    pass
+    try:
+        assert([fact(n) for n in range(7)] == [1, 1, 2, 6, 24, 120, 720])
+        assert(fact(20) == 2432902008176640000)
+    except Exception as e:
+        pytest.fail(f"Failed factorial: {e}")
+
+    with pytest.raises(ValueError):
+        fact(-1)
 
 def test_n_choose_k() -> int:
-    #TODO
-    pass
+    try:
+        assert([n_choose_k(5, k) for k in range(6)] == [1, 5, 10, 10, 5, 1])
+        assert(n_choose_k(52, 5) == 2598960)
+        assert(n_choose_k(100, 50) == 100891344545564193334812497256)
+    except Exception as e:
+        pytest.fail(f"Failed n choose k: {e}")
+
+    with pytest.raises(ValueError):
+        n_choose_k(5, 6)
 
 def test_pascals_triangle() -> list:
-    #TODO
-    pass
+    try:
+        assert(pascals_triangle(5) == [[1], [1, 1], [1, 2, 1], [1, 3, 3, 1], [1, 4, 6, 4, 1]])
+        assert(pascals_triangle(0) == [])
+
+        rows = list(pascals_triangle_rows(60))
+        assert(all(row == [n_choose_k(i, k) for k in range(i + 1)] for i, row in enumerate(rows)))
+        assert(all(pascals_triangle_row(i) == row for i, row in enumerate(rows)))
+
+        assert(list(pascals_triangle_rows(60, 7)) == [[c % 7 for c in row] for row in rows])
+        assert(pascals_triangle_row(59, 7) == [c % 7 for c in rows[-1]])
+        assert(next(islice(pascals_triangle_rows(), 10, None)) == rows[10])
+    except Exception as e:
+        pytest.fail(f"Failed pascals triangle: {e}")
+
+    with pytest.raises(ValueError):
+        pascals_triangle_row(-1)
 
 def test_print_pascals_triangle() -> None:
-    #TODO
-    pass
+    try:
+        out = io.StringIO()
+        print_pascals_triangle(4, file=out)
+        assert(out.getvalue() == "   1   \n  1 1  \n 1 2 1 \n1 3 3 1\n")
+    except Exception as e:
+        pytest.fail(f"Failed to print pascals triangle: {e}")
 
 def test_binomial_pmf() -> None:
-    #TODO
-    pass
+    try:
+        for k in range(11):
+            expected = n_choose_k(10, k) * 0.3**k * 0.7**(10 - k)
+            assert(abs(binomial_pmf(10, k, 0.3) - expected) < 1e-14)
+        assert(binomial_pmf(10, 11, 0.3) == 0)
+        assert(binomial_pmf(10, 0, 0) == 1)
+
+        # the whole distribution in one call, for n far past where n! overflows a float
+        pmf = binomial_pmf(100000, np.arange(100001), 0.3)
+        assert(abs(pmf.sum() - 1) < 1e-8)
+        assert(pmf.argmax() == 30000)
+        assert(binomial_logpmf(100000, 0, 0.3) == 100000 * np.log(0.7))
+
+        assert(binomial_pmf(np.array([[10], [20]]), [0, 1, 2], 0.5).shape == (2, 3))
+
+        # k that are not whole numbers are outside the support rather than truncated
+        assert(binomial_pmf(10, [2.5, 2.0, np.nan], 0.3).tolist() == [0, binomial_pmf(10, 2, 0.3), 0])
+        assert(binomial_logpmf(10, 2.5, 0.3) == -np.inf)
+    except Exception as e:
+        pytest.fail(f"Failed binomial pmf: {e}")
+
+    with pytest.raises(ValueError):
+        binomial_pmf(10, 2, 1.5)
+    with pytest.raises(ValueError):
+        binomial_pmf(10.5, 2, 0.3)
 
 def test_plot_binomial_pmf() -> None:
-    #TODO
-    pass
+    try:
+        plot_binomial_pmf(20, 0.4)
+    except Exception as e:
+        pytest.fail(f"plot_binomial_pmf raised an exception: {e}")
 
 def test_geometric_pmf() -> None:
-    #TODO
-    pass
+    try:
+        assert(np.allclose(geometric_pmf(np.arange(5), 0.5), [0, 0.5, 0.25, 0.125, 0.0625], rtol=1e-15))
+        assert(geometric_pmf(1, 1) == 1)
+        assert(abs(geometric_pmf(np.arange(1, 2000), 0.01).sum() - (1 - 0.99**1999)) < 1e-12)
+        assert(geometric_pmf([1.5, 2.0], 0.5).tolist() == [0, 0.25])
+    except Exception as e:
+        pytest.fail(f"Failed geometric pmf: {e}")
+
+    with pytest.raises(ValueError):
+        geometric_pmf(3, 0)
 
 def test_plot_geometric_pmf() -> None:
-    #TODO
-    pass
+    try:
+        plot_geometric_pmf(20, 0.3)
+    except Exception as e:
+        pytest.fail(f"plot_geometric_pmf raised an exception: {e}")
 
 def test_poisson_pmf() -> None:
-    #TODO
-    pass
+    try:
+        for k in range(20):
+            expected = 2.5**k * np.exp(-2.5) / fact(k)
+            assert(abs(poisson_pmf(k, 2.5) - expected) < 1e-14)
+        assert(poisson_pmf(-1, 2.5) == 0)
+        assert(poisson_pmf(2.5, 2.5) == 0 and poisson_pmf(2.0, 2.5) == poisson_pmf(2, 2.5))
+
+        # k! and l**k overflow a float long before the pmf itself underflows
+        pmf = poisson_pmf(np.arange(5000), 2000.0)
+        assert(abs(pmf.sum() - 1) < 1e-9)
+        assert(np.isfinite(poisson_logpmf(10**6, 1.5)))
+    except Exception as e:
+        pytest.fail(f"Failed poisson pmf: {e}")
+
+    for l in (-1.0, 0, [2.5, 0]):
+        with pytest.raises(ValueError):
+            poisson_pmf(3, l)
 
 def test_plot_poisson_pmf() -> None:
-    #TODO
-    pass
+    try:
+        plot_poisson_pmf(20, 4.0)
+    except Exception as e:
+        pytest.fail(f"plot_poisson_pmf raised an exception: {e}")
+
+def test_normal_distribution() -> None:
+    try:
+        dist = Normal(1, 2)
+        x = np.linspace(-10, 10, 101)
+        assert(np.allclose(dist.pdf(x), normal_pdf(x, 1, 2), rtol=1e-14))
+        assert(abs(dist.cdf(1) - 0.5) < 1e-15)
+        assert(abs(Normal().cdf(1.959963984540054) - 0.975) < 1e-15)
+        assert(abs(Normal().sf(10) - 7.619853024160527e-24) < 1e-36)
+        # the tails hold their relative precision on both sides of every approximation range
+        z = np.array([-8, -3, -0.5, 0, 0.4, 0.7, 3, 5.5, 9, 37])
+        assert(np.allclose(Normal().sf(z), [0.5 * math.erfc(v / math.sqrt(2)) for v in z], rtol=1e-14, atol=0))
+        assert(Normal().cdf([-np.inf, np.inf]).tolist() == [0, 1])
+
+        q = np.array([1e-300, 1e-12, 0.001, 0.02425, 0.3, 0.5, 0.9, 0.999999])
+        assert(np.allclose(dist.cdf(dist.ppf(q)), q, rtol=1e-12))
+        assert(Normal().ppf([0, 1]).tolist() == [-np.inf, np.inf])
+        assert(np.isnan(Normal().ppf(1.5)))
+
+        samples = dist.sample(100000, rng=0)
+        assert(abs(samples.mean() - 1) < 0.05 and abs(samples.std() - 2) < 0.05)
+        assert(isinstance(dist.sample(), float))
+    except Exception as e:
+        pytest.fail(f"Failed normal distribution: {e}")
+
+    with pytest.raises(ValueError):
+        Normal(0, 0)
+
+def test_continuous_distributions() -> None:
+    try:
+        q = np.linspace(0.001, 0.999, 99)
+        for dist in [Exponential(2.5), Laplace(1.5, 0.3), Uniform(-1, 3)]:
+            assert(np.allclose(dist.cdf(dist.ppf(q)), q, atol=1e-14))
+            assert(np.allclose(dist.sf(dist.ppf(q)), 1 - q, atol=1e-14))
+            assert(np.allclose(np.exp(dist.logpdf(dist.ppf(q))), dist.pdf(dist.ppf(q))))
+            assert(dist.sample((3, 4), rng=1).shape == (3, 4))
+
+        x = np.linspace(-5, 5, 101)
+        assert(np.allclose(Exponential(2).pdf(x[x >= 0]), exp_pdf(x[x >= 0], 2)))
+        assert(np.allclose(Laplace(2).pdf(x), doubly_exp_pdf(x, 2)))
+        assert(np.allclose(Uniform(0, 2).pdf(x), uniform_pdf(x, 0, 2)))
+        assert(Exponential(2).pdf(-1) == 0 and Exponential(2).cdf(-1) == 0)
+        assert(Uniform(0, 2).cdf(5) == 1 and Uniform(0, 2).sf(5) == 0)
+    except Exception as e:
+        pytest.fail(f"Failed continuous distributions: {e}")
+
+    for make in [lambda: Exponential(0), lambda: Laplace(-1), lambda: Uniform(1, 1)]:
+        with pytest.raises(ValueError):
+            make()
+
+    # degenerate or inverted bounds, including one pair among broadcast bounds
+    for a, b in [(1, 1), (2, 1), ([0, 2], [1, 1])]:
+        with pytest.raises(ValueError):
+            uniform_pdf(0.5, a, b)
+
+PDF_CASES = [
+    (normal_pdf, (0.5, 2)),
+    (uniform_pdf, (-1, 2)),
+    (exp_pdf, (1.5,)),
+    (doubly_exp_pdf, (1.5,)) ]
+
+@pytest.mark.parametrize("pdf, params", PDF_CASES)
+def test_pdf_scalar_array_parity(pdf, params) -> None:
+    x = np.linspace(-3, 3, 13)
+    values = pdf(x, *params)
+
+    # scalars in give floats out, arrays in give ndarrays out, with identical values
+    assert(isinstance(values, np.ndarray) and values.shape == x.shape)
+    scalars = [pdf(xi, *params) for xi in x.tolist()]
+    assert(all(type(s) is float for s in scalars))
+    assert(values.tolist() == scalars)
+    assert(isinstance(pdf(x.tolist(), *params), np.ndarray))
+
+@pytest.mark.parametrize("pdf, params", PDF_CASES)
+def test_pdf_out_and_broadcasting(pdf, params) -> None:
+    x = np.linspace(-3, 3, 13)
+
+    buffer = np.empty_like(x)
+    assert(pdf(x, *params, out=buffer) is buffer)
+    assert(np.array_equal(buffer, pdf(x, *params)))
+
+    # out may be the input array itself
+    aliased = x.copy()
+    assert(pdf(aliased, *params, out=aliased) is aliased)
+    assert(np.array_equal(aliased, pdf(x, *params)))
+
+    # each parameter broadcasts against x
+    grid = pdf(x[:, None], *(np.array([p, p + 1]) for p in params))
+    assert(grid.shape == (13, 2))
+    assert(np.array_equal(grid[:, 0], pdf(x, *params)))
+    assert(np.array_equal(grid[:, 1], pdf(x, *(p + 1 for p in params))))
+
+def test_sum_pmf():
+    try:
+        totals, pmf_values = dice_sum_pmf(2)
+        assert(totals.tolist() == list(range(2, 13)))
+        assert(np.allclose(pmf_values * 36, [1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1]))
+
+        # thousands of dice go through the FFT path and keep the exact mean and variance
+        totals, pmf_values = dice_sum_pmf(3000, weights=[1, 2, 3, 4, 5, 6])
+        face_mean, face_var = 91 / 21, 441 / 21 - (91 / 21)**2
+        assert(totals[0] == 3000 and totals[-1] == 18000)
+        assert(pmf_values.sum() == pytest.approx(1))
+        assert((totals * pmf_values).sum() == pytest.approx(3000 * face_mean))
+        assert(((totals - 3000 * face_mean)**2 * pmf_values).sum() == pytest.approx(3000 * face_var))
+        assert(pmf_values.min() >= 0)
+
+        # sums of Bernoulli trials are binomial
+        k, pmf_values = sum_pmf(binomial_pmf(1, [0, 1], 0.3), 500)
+        assert(np.allclose(pmf_values, binomial_pmf(500, k, 0.3), atol=1e-14))
+
+        # zero-probability ends shift the support instead of widening it
+        values, pmf_values = sum_pmf([0, 0, 1, 1, 0], 3)
+        assert(values.tolist() == [6, 7, 8, 9] and np.allclose(pmf_values, [1/8, 3/8, 3/8, 1/8]))
+        assert(sum_pmf([0.2, 0.8], 0)[1].tolist() == [1])
+
+        plot_dice_sum_pmf(10)
+    except Exception as e:
+        pytest.fail(f"Failed to compute the distribution of a sum: {e}")
 
+    with pytest.raises(ValueError):
+        sum_pmf([0, 0], 3)
+    with pytest.raises(ValueError):
+        sum_pmf([0.5, -0.5, 1], 3)
+    with pytest.raises(ValueError):
+        sum_pmf([0.5, 0.5], -1)
+    with pytest.raises(ValueError):
+        dice_sum_pmf(3, 6, [1, 2])
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from mathlib.series import *
 
 def test_sum_integers() -> None:
@@ -24,3 +25,73 @@ def test_get_fibonnaci() -> None:
         with pytest.raises(ValueError) as e_info:
             get_fibonacci(*v)
         assert str(e_info)
+
+def test_fibonacci() -> None:
+    try:
+        seq = get_fibonacci(200)
+        assert([fibonacci(i) for i in range(201)] == seq)
+        assert([fibonacci(i, 97) for i in range(201)] == [f % 97 for f in seq])
+        assert(fibonacci(10**6, 10**9 + 7) == 918091266)
+    except Exception as e:
+        pytest.fail(f"Failed to get fibonacci number: {e}")
+
+    for v in [(-1,), (1.0,), (5, 0)]:
+        with pytest.raises(ValueError):
+            fibonacci(*v)
+
+def test_fibonacci_sequence() -> None:
+    try:
+        seq = get_fibonacci(200)
+        assert(list(islice(fibonacci_sequence(), 201)) == seq)
+        assert(list(islice(fibonacci_sequence(150), 51)) == seq[150:])
+        assert(list(islice(fibonacci_sequence(150, 1000), 51)) == [f % 1000 for f in seq[150:]])
+    except Exception as e:
+        pytest.fail(f"Failed to generate fibonacci sequence: {e}")
+
+    with pytest.raises(ValueError):
+        next(fibonacci_sequence(-1))
+
+def test_sum_integers_batch() -> None:
+    try:
+        queries = [(1, 1, 1), (1000, 3, 1), (22, 3, 7), (22, 3, 6), (22, 3, 5)]
+        N, m, start = (np.array(q) for q in zip(*queries))
+        result = sum_integers_batch(N, m, start)
+        assert(result.dtype == np.int64)
+        assert(result.tolist() == [sum_integers(*q) for q in queries])
+
+        # scalars broadcast against arrays
+        assert(sum_integers_batch(np.arange(10), 2).tolist() == [sum_integers(n, 2) for n in range(10)])
+
+        # answers past int64 are computed exactly with Python ints
+        big = sum_integers_batch([10**18, 10])
+        assert(big.tolist() == [sum_integers(10**18), 55])
+
+        # a start far past N overflows just the same
+        big = sum_integers_batch(10, 1, 10**18)
+        assert(big == sum_integers(10, 1, 10**18))
+        assert(sum_integers_batch([10], 1, 10**18).dtype == object)
+
+        # Python ints that do not fit int64 at all
+        huge = sum_integers_batch([10**30, 10], [1, 2], [1, 3])
+        assert(huge.tolist() == [sum_integers(10**30), sum_integers(10, 2, 3)])
+    except Exception as e:
+        pytest.fail(f"Failed to test batch summing integers: {e}")
+
+    with pytest.raises(ValueError):
+        sum_integers_batch([10, 10], [1, 0])
+
+def test_sum_powers() -> None:
+    try:
+        assert(sum_powers(100, 1) == sum_integers(100))
+        assert(sum_powers(22, 1, 3, 7) == sum_integers(22, 3, 7))
+        assert(sum_powers(100, 0) == 100)
+        assert(sum_powers(10, 2) == 385)
+        assert(sum_powers(30, 3, 2, 5) == sum(i**3 for i in range(6, 31, 2)))
+        assert(sum_powers(200, 25) == sum(i**25 for i in range(1, 201)))
+        assert(sum_powers(10**9, 2) == 10**9 * (10**9 + 1) * (2 * 10**9 + 1) // 6)
+        assert(sum_powers(5, 2, start=10) == 0)
+    except Exception as e:
+        pytest.fail(f"Failed to test summing powers: {e}")
+
+    with pytest.raises(ValueError):
+        sum_powers(10, -1)
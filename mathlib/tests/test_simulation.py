@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+from functools import partial
+from mathlib.probability import die_rolls, coin_tosses
+from mathlib.simulation import *
+
+def two_dice(size, rng=None):
+    return die_rolls(size, rng=rng) + die_rolls(size, rng=rng)
+
+def test_run_simulation() -> None:
+    try:
+        serial = run_simulation(two_dice, 100000, seed=1, chunk_size=10000)
+        assert(sum(serial.counts.values()) == 100000)
+        assert(list(serial.counts) == list(range(2, 13)))
+        assert(abs(serial.frequencies[7] - 1/6) < 0.01)
+        assert(serial.throughput > 0)
+
+        # the same seed gives the same counts however many workers run it
+        parallel = run_simulation(two_dice, 100000, seed=1, workers=3, chunk_size=10000)
+        assert(parallel.counts == serial.counts)
+
+        tosses = run_simulation(partial(coin_tosses, bias=0.3), 50000, seed=2, workers=2, chunk_size=8192)
+        assert(abs(tosses.frequencies['H'] - 0.3) < 0.01)
+    except Exception as e:
+        pytest.fail(f"Failed to run simulation: {e}")
+
+    with pytest.raises(ValueError):
+        run_simulation(two_dice, 0)
+
+def test_run_simulation_histogram() -> None:
+    try:
+        edges = np.arange(1.5, 13.5)
+        result = run_simulation(two_dice, 100000, seed=1, bins=edges, chunk_size=10000)
+        assert(result.histogram.tolist() == list(run_simulation(two_dice, 100000, seed=1, chunk_size=10000).counts.values()))
+        assert(result.counts == {})
+
+        normal = run_simulation(lambda size, rng: rng.normal(size=size), 20000, seed=0, bins=10)
+        assert(len(normal.bin_edges) == 11)
+        assert(normal.histogram.sum() <= 20000)
+
+        # the chunk that sets the bin edges is counted, not run a second time
+        calls = []
+        def counted(size, rng):
+            calls.append(size)
+            return rng.normal(size=size)
+        counted_result = run_simulation(counted, 20000, seed=0, bins=10, chunk_size=5000)
+        assert(calls == [5000] * 4)
+        assert(counted_result.histogram.sum() <= 20000)
+    except Exception as e:
+        pytest.fail(f"Failed to run simulation histogram: {e}")
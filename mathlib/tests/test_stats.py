@@ -0,0 +1,60 @@
+import pytest
+import pickle
+import numpy as np
+from mathlib.stats import *
+
+def test_streaming_stats() -> None:
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=200000)
+
+    try:
+        stats = StreamingStats(20, (-4, 4))
+        for chunk in np.array_split(data, 13):
+            stats.update(chunk)
+
+        assert(stats.count == len(data))
+        assert(abs(stats.mean - data.mean()) < 1e-12)
+        assert(abs(stats.variance - data.var()) < 1e-12)
+        assert(stats.min == data.min() and stats.max == data.max())
+        assert(np.array_equal(stats.counts, np.histogram(data, stats.bin_edges)[0]))
+        assert(stats.counts.sum() + stats.underflow + stats.overflow == len(data))
+
+        q = [0.01, 0.1, 0.5, 0.9, 0.99]
+        assert(np.allclose(stats.quantile(q), np.quantile(data, q), atol=0.02))
+        assert(stats.quantile(0) == data.min() and stats.quantile(1) == data.max())
+    except Exception as e:
+        pytest.fail(f"Failed streaming stats: {e}")
+
+    with pytest.raises(ValueError):
+        StreamingStats(10)
+    with pytest.raises(ValueError):
+        StreamingStats(10, (0, 1)).quantile(0.5)
+
+def test_streaming_stats_merge() -> None:
+    rng = np.random.default_rng(1)
+    data = rng.exponential(size=100000)
+
+    try:
+        # accumulators round-trip through pickle as they would between processes
+        parts = [pickle.loads(pickle.dumps(StreamingStats(10, (0, 5)).update(c))) for c in np.array_split(data, 4)]
+        merged = StreamingStats(10, (0, 5))
+        for part in parts:
+            merged.merge(part)
+
+        assert(merged.count == len(data))
+        assert(abs(merged.mean - data.mean()) < 1e-12)
+        assert(abs(merged.variance - data.var()) < 1e-12)
+        assert(np.array_equal(merged.counts, np.histogram(data, merged.bin_edges)[0]))
+        assert(merged.overflow == (data > 5).sum())
+        assert(abs(merged.quantile(0.5) - np.median(data)) < 0.01)
+    except Exception as e:
+        pytest.fail(f"Failed streaming stats merge: {e}")
+
+    with pytest.raises(ValueError):
+        merged.merge(StreamingStats(5, (0, 5)))
+
+def test_streaming_stats_plot() -> None:
+    try:
+        StreamingStats(15, (-3, 3)).update(np.random.default_rng(2).normal(size=10000)).plot()
+    except Exception as e:
+        pytest.fail(f"StreamingStats.plot raised an exception: {e}")
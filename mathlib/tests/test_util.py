@@ -1,4 +1,7 @@
 import pytest
+import numpy as np
+import mathlib.util
+from itertools import islice
 from mathlib.util import *
 
 def test_get_prime_factors() -> None:
@@ -14,4 +17,113 @@ def test_get_prime_factors() -> None:
         try:
             assert(get_prime_factors(v[0]) == v[1])
         except Exception as e:
-            pytest.fail(f"Failed to find prime factors: {e}")
\ No newline at end of file
+            pytest.fail(f"Failed to find prime factors: {e}")
+
+def test_factorize() -> None:
+    values = list(range(1, 2000)) + [600851475143, 1000003 * 1000033]
+    expected = [get_prime_factors(v) for v in values]
+
+    try:
+        assert(factorize(values) == expected)
+        assert(factorize(np.array(values, dtype=np.int64)) == expected)
+        # a tiny bound forces the trial division fallback past the prime table
+        assert(factorize(values, bound=10) == expected)
+        assert(factorize([]) == [])
+    except Exception as e:
+        pytest.fail(f"Failed to factorize batch: {e}")
+
+    with pytest.raises(ValueError):
+        factorize([12, 0])
+
+def test_is_prime() -> None:
+    try:
+        assert([n for n in range(-3, 30) if is_prime(n)] == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        # Carmichael numbers and strong pseudoprimes to the first several prime bases
+        for n in [561, 3215031751, 3825123056546413051, 318665857834031151167461]:
+            assert(not is_prime(n))
+        for n in [2**61 - 1, 10**18 + 9, 2**89 - 1, 2**127 - 1]:
+            assert(is_prime(n))
+    except Exception as e:
+        pytest.fail(f"Failed primality test: {e}")
+
+def test_get_prime_factors_large(monkeypatch) -> None:
+    test_vector = [
+        (2**64 + 1, [274177, 67280421310721]),
+        (2**67 - 1, [193707721, 761838257287]),
+        ((10**9 + 7) * (10**9 + 9), [10**9 + 7, 10**9 + 9]),
+        (2**5 * (2**89 - 1), [2, 2, 2, 2, 2, 2**89 - 1]),
+        (2**127 - 1, [2**127 - 1]),
+        # perfect powers of large primes, which rho alone would take about sqrt(p) steps on
+        ((2**61 - 1)**2, [2**61 - 1] * 2),
+        ((2**89 - 1)**2, [2**89 - 1] * 2),
+        (7 * (2**31 - 1)**2 * (2**61 - 1)**3, [7] + [2**31 - 1] * 2 + [2**61 - 1] * 3),
+        (3**40 * (2**61 - 1)**6, [3] * 40 + [2**61 - 1] * 6),
+        # between the sieve bound and its square
+        (999999999989, [999999999989]),
+        (999983 * 1000003, [999983, 1000003]),
+        (2**3 * 1000003, [2, 2, 2, 1000003]) ]
+
+    # values above the sieve bound only trial-divide up to TRIAL_LIMIT
+    limits = set()
+    trial_division = mathlib.util._trial_division
+    monkeypatch.setattr('mathlib.util._trial_division', lambda N, limit: limits.add(limit) or trial_division(N, limit))
+    for v in test_vector:
+        try:
+            assert(get_prime_factors(v[0]) == v[1])
+        except Exception as e:
+            pytest.fail(f"Failed to find prime factors: {e}")
+
+    try:
+        assert(limits == {TRIAL_LIMIT})
+    except Exception as e:
+        pytest.fail(f"Failed to skip trial division above the sieve bound: {e}")
+
+    # two primes near 2**64 are out of rho's reach, so it gives up instead of running for hours
+    monkeypatch.setattr('mathlib.util.RHO_MAX_ITERATIONS', 2**12)
+    with pytest.raises(RuntimeError):
+        get_prime_factors(18446744073709551557 * 18446744073709551533)
+
+def test_primes_up_to() -> None:
+    try:
+        assert(primes_up_to(1) == [])
+        assert(primes_up_to(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        assert(len(primes_up_to(10**5)) == 9592)
+    except Exception as e:
+        pytest.fail(f"Failed to list primes: {e}")
+
+def test_primes_in_range(monkeypatch) -> None:
+    reference = np.array(primes_up_to(10**6))
+    try:
+        for lo, hi in [(0, 100), (2, 3), (3, 4), (999, 1000), (12345, 10**6), (0, 10**6)]:
+            expected = reference[(reference >= lo) & (reference < hi)]
+            # small windows make the ranges span many segments
+            assert(np.array_equal(primes_in_range(lo, hi), expected))
+            assert(np.array_equal(primes_in_range(lo, hi, segment_size=1000), expected))
+
+        assert(primes_in_range(100, 10).size == 0)
+        assert(primes_in_range(0, 10).dtype == np.int64)
+
+        large = primes_in_range(10**12, 10**12 + 10**4)
+        assert(large.tolist() == [n for n in range(10**12, 10**12 + 10**4) if is_prime(n)])
+        assert(np.array_equal(primes_in_range(0, 10**6, workers=2, segment_size=10**4), reference))
+
+        # tiny batches split the large base primes' multiples into many scatters
+        monkeypatch.setattr('mathlib.util._SCATTER_SIZE', 7)
+        assert(np.array_equal(primes_in_range(10**12, 10**12 + 10**4), large))
+    except Exception as e:
+        pytest.fail(f"Failed to list primes in range: {e}")
+
+    with pytest.raises(ValueError):
+        primes_in_range(0, 100, segment_size=0)
+
+def test_iter_primes() -> None:
+    try:
+        assert(list(iter_primes(hi=30)) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        assert(list(iter_primes(10**5, 2 * 10**5, segment_size=777)) == [p for p in primes_up_to(2 * 10**5) if p >= 10**5])
+        assert(list(islice(iter_primes(10**12), 3)) == [1000000000039, 1000000000061, 1000000000063])
+
+        # an unbounded generator keeps going past every window
+        primes = iter_primes(segment_size=100)
+        assert(list(islice(primes, 10**4))[-1] == 104729)
+    except Exception as e:
+        pytest.fail(f"Failed to iterate primes: {e}")
@@ -1,21 +1,479 @@
+import numpy as np
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from math import gcd, isqrt
+
+# default bound below which numbers are factored with the smallest-prime-factor sieve
+SIEVE_BOUND = 10**6
+
+# values above the sieve bound only have primes up to this limit divided out
+# before switching to Miller-Rabin and Pollard-rho
+TRIAL_LIMIT = 2**10
+
+# odd numbers covered by one window of the segmented sieve; its flags take about
+# this many bytes, so a window stays inside a typical L2 cache
+SEGMENT_SIZE = 2**18
+
+# base primes below this are crossed off with strided slices, larger ones with scatters
+_SLICE_PRIME_LIMIT = 2**10
+
+# multiples crossed off per scatter, which keeps its int64 index arrays at 128 KiB
+# each so they fit in L2 cache beside the window's flags
+_SCATTER_SIZE = 2**14
+
+# Pollard-rho gives up after this many steps. Splitting N takes about sqrt(p) steps for
+# its smallest prime factor p, so this covers factors up to about 2**44; a product of
+# two primes near 2**64 would take billions of steps
+RHO_MAX_ITERATIONS = 2**22
+
+# Miller-Rabin with these bases is deterministic for every N below _MR_DETERMINISTIC_LIMIT
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+# lazily grown smallest-prime-factor table and the primes it contains
+_spf = np.zeros(0, dtype=np.int64)
+_primes = []
+
+def _grow_sieve(limit: int) -> None:
+    """
+    Make sure the smallest-prime-factor sieve covers every integer up to limit.
+    The sieve at least doubles each time it is rebuilt so repeated growth is cheap.
+
+    Parameters:
+    - limit: the largest integer the sieve must cover.
+    """
+    global _spf, _primes
+    if limit < len(_spf):
+        return
+
+    size = max(limit + 1, 2 * len(_spf), 16)
+    spf = np.zeros(size, dtype=np.int64)
+
+    # mark each composite with the first (smallest) prime that reaches it
+    for p in range(2, isqrt(size - 1) + 1):
+        if spf[p] == 0:
+            multiples = spf[p*p::p]
+            multiples[multiples == 0] = p
+
+    # whatever is left unmarked is prime and is its own smallest factor
+    unmarked = np.flatnonzero(spf == 0)
+    spf[unmarked] = unmarked
+
+    _spf = spf
+    _primes = unmarked[unmarked >= 2].tolist()
+
+def primes_up_to(N: int) -> list:
+    """
+    Return the list of primes up to and including N, read from the shared sieve.
+
+    Parameters:
+    - N: the largest number to consider.
+    """
+    _grow_sieve(N)
+    return _primes[:bisect_right(_primes, N)]
+
+def _sieve_segment(lo: int, hi: int, base: np.ndarray) -> np.ndarray:
+    """
+    Return the primes in [lo, hi) as an int64 array, sieving only odd numbers.
+
+    Parameters:
+    - lo: the first number of the segment, at least 2.
+    - hi: the end of the segment.
+    - base: the odd primes up to isqrt(hi - 1).
+    """
+    first = lo | 1
+    size = max(0, (hi - first + 1) // 2)
+    # flags[i] says whether first + 2*i is prime
+    flags = np.ones(size, dtype=bool)
+    if first == 1 and size:
+        flags[0] = False
+
+    base = base[base * base < hi]
+    if len(base):
+        # the first odd multiple of each prime in the segment, at least p*p
+        start = np.maximum(base * base, -(-first // base) * base)
+        start += base * (start % 2 == 0)
+        index = (start - first) // 2
+
+        small = base < _SLICE_PRIME_LIMIT
+        for p, i in zip(base[small].tolist(), index[small].tolist()):
+            flags[i::p] = False
+
+        # the rest hit the segment a few times each, so generate their indices in
+        # batches of about _SCATTER_SIZE multiples
+        p, i = base[~small], index[~small]
+        hits = np.maximum(0, -(-(size - i) // p))
+        total = np.cumsum(hits)
+        cuts = np.searchsorted(total, np.arange(_SCATTER_SIZE, total[-1], _SCATTER_SIZE)).tolist() if len(p) else []
+        for j0, j1 in zip([0] + cuts, cuts + [len(p)]):
+            pj, ij, hj = p[j0:j1], i[j0:j1], hits[j0:j1]
+            n = int(hj.sum())
+            if n:
+                offsets = np.arange(n) - np.repeat(np.cumsum(hj) - hj, hj)
+                flags[np.repeat(ij, hj) + offsets * np.repeat(pj, hj)] = False
+
+    primes = first + 2 * np.flatnonzero(flags)
+    if lo <= 2 < hi:
+        primes = np.concatenate(([2], primes))
+    return primes
+
+def _base_primes(hi: int) -> np.ndarray:
+    """
+    Return the odd primes up to isqrt(hi - 1), which sieve every number below hi.
+    """
+    return np.array(primes_up_to(isqrt(max(hi - 1, 0)))[1:], dtype=np.int64)
+
+def _sieve_range(lo: int, hi: int, segment_size: int) -> np.ndarray:
+    """
+    Return the primes in [lo, hi), sieving one window of segment_size odd numbers at a time.
+    """
+    base = _base_primes(hi)
+    span = 2 * segment_size
+    segments = [_sieve_segment(start, min(start + span, hi), base) for start in range(lo, hi, span)]
+    return np.concatenate(segments) if segments else np.zeros(0, dtype=np.int64)
+
+def primes_in_range(lo: int, hi: int, workers: int = None, segment_size: int = SEGMENT_SIZE) -> np.ndarray:
+    """
+    Return the primes p with lo <= p < hi as an int64 NumPy array.
+
+    Uses a segmented Sieve of Eratosthenes over odd numbers: the range is swept
+    in windows of segment_size odd numbers, each crossed off by the base primes
+    up to sqrt(hi) from the shared sieve. Memory beyond the result stays fixed
+    however wide or far out the range is, so ranges up to about 10**12 and
+    beyond can be swept.
+
+    Parameters:
+    - lo: the start of the range.
+    - hi: the end of the range, not included.
+    - workers: the number of processes sieving disjoint parts of the range
+      (default: None, sieve in this process).
+    - segment_size: the number of odd numbers per window (default: SEGMENT_SIZE).
+    """
+    if segment_size < 1:
+        raise ValueError("segment_size must be a positive integer.")
+
+    lo = max(lo, 2)
+    if hi <= lo:
+        return np.zeros(0, dtype=np.int64)
+
+    if workers is None or workers <= 1:
+        return _sieve_range(lo, hi, segment_size)
+
+    # split the range into whole windows, about four tasks per worker so the load
+    # evens out; the primes found are the same however the range is split
+    span = 2 * segment_size * max(1, -(-(hi - lo) // (2 * segment_size * 4 * workers)))
+    starts = list(range(lo, hi, span))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(_sieve_range, starts, [min(start + span, hi) for start in starts], [segment_size] * len(starts))
+        return np.concatenate(list(parts))
+
+def iter_primes(lo: int = 2, hi: int = None, segment_size: int = SEGMENT_SIZE):
+    """
+    Lazily generate the primes p with lo <= p < hi in increasing order.
+
+    Sieves one window of segment_size odd numbers at a time, only when the
+    previous window's primes have been consumed.
+
+    Parameters:
+    - lo: the first number to consider (default: 2).
+    - hi: the end of the range, not included (default: None, generate forever).
+    - segment_size: the number of odd numbers per window (default: SEGMENT_SIZE).
+    """
+    if segment_size < 1:
+        raise ValueError("segment_size must be a positive integer.")
+
+    span = 2 * segment_size
+    covered = 0
+    for start in count(max(lo, 2), span):
+        if hi is not None and start >= hi:
+            return
+        end = start + span if hi is None else min(start + span, hi)
+
+        # the base primes sieve every number below covered; extend them well ahead when passed
+        if end > covered:
+            covered = max(end, 2 * start)
+            base = _base_primes(covered)
+        yield from _sieve_segment(start, end, base).tolist()
+
+def _trial_division(N: int, limit: int) -> tuple:
+    """
+    Divide the cached primes up to limit out of N.
+    Returns the factors found and the remaining cofactor.
+
+    Parameters:
+    - N: the positive integer to factor.
+    - limit: the largest prime to divide by.
+    """
+    factors = []
+    for p in _primes:
+        if p > limit or p * p > N:
+            break
+        while N % p == 0:
+            factors.append(p)
+            N //= p
+
+    return factors, N
+
+def _is_strong_probable_prime(N: int, a: int) -> bool:
+    """
+    Miller-Rabin strong probable prime test of an odd N > 2 to base a.
+    """
+    d, s = N - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    x = pow(a, d, N)
+    if x == 1 or x == N - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % N
+        if x == N - 1:
+            return True
+
+    return False
+
+def _jacobi(a: int, n: int) -> int:
+    """
+    Jacobi symbol (a/n) for an odd positive n.
+    """
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+
+    return result if n == 1 else 0
+
+def _is_strong_lucas_probable_prime(N: int) -> bool:
+    """
+    Strong Lucas probable prime test of an odd N > 2 with Selfridge's parameters.
+    """
+    if isqrt(N)**2 == N:
+        return False
+
+    # find the first D in 5, -7, 9, -11, ... with Jacobi symbol (D/N) = -1
+    D = 5
+    while True:
+        j = _jacobi(D, N)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != N:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d, s = N + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # walk the bits of d to get U_d, V_d and Q^d mod N
+    U, V, Qk = 1, P, Q % N
+    for bit in bin(d)[3:]:
+        U, V, Qk = U * V % N, (V * V - 2 * Qk) % N, Qk * Qk % N
+        if bit == '1':
+            U, V = P * U + V, D * U + P * V
+            U = (U + N if U % 2 else U) // 2 % N
+            V = (V + N if V % 2 else V) // 2 % N
+            Qk = Qk * Q % N
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % N
+        if V == 0:
+            return True
+        Qk = Qk * Qk % N
+
+    return False
+
+def is_prime(N: int) -> bool:
+    """
+    Return True if N is prime.
+
+    Numbers covered by the smallest-prime-factor sieve are looked up directly.
+    Larger numbers use Miller-Rabin, which is deterministic below 3.3e24, and
+    the Baillie-PSW test (no known counterexample) above that.
+
+    Parameters:
+    - N: the integer to test.
+    """
+    N = int(N)
+    if N < 2:
+        return False
+    if N < len(_spf):
+        return bool(_spf[N] == N)
+    for p in _MR_BASES:
+        if N % p == 0:
+            return N == p
+
+    if N < _MR_DETERMINISTIC_LIMIT:
+        return all(_is_strong_probable_prime(N, a) for a in _MR_BASES)
+
+    return _is_strong_probable_prime(N, 2) and _is_strong_lucas_probable_prime(N)
+
+def _iroot(N: int, k: int) -> int:
+    """
+    Return the integer k-th root of N, the largest r with r**k <= N.
+    """
+    # Newton's method started above the root decreases to its floor
+    r = 1 << -(-N.bit_length() // k)
+    while True:
+        s = ((k - 1) * r + N // r**(k - 1)) // k
+        if s >= r:
+            break
+        r = s
+    while r**k > N:
+        r -= 1
+    return r
+
+def _perfect_power(N: int, min_root: int) -> tuple:
+    """
+    Return (r, k) with r**k == N for the largest such k, or (N, 1) if N is not a perfect power.
+
+    Parameters:
+    - N: the integer to test.
+    - min_root: a lower bound on any root, e.g. because no prime below it divides N.
+      Only exponents with min_root**k <= N need to be tried.
+    """
+    root, power = N, 1
+    k = 2
+    while min_root**k <= root:
+        r = _iroot(root, k)
+        if r**k == root:
+            # keep taking roots, e.g. p**6 is (p**3)**2 and then p**3
+            root, power = r, power * k
+            continue
+        k += 1
+    return root, power
+
+def _pollard_brent(N: int) -> int:
+    """
+    Find a nontrivial factor of the odd composite N with Brent's variant of Pollard-rho.
+    The gcd is taken over batches of products so it runs once per batch rather than per step.
+
+    Parameters:
+    - N: an odd composite integer that is not a perfect power.
+    """
+    batch = 128
+    steps = 0
+    for c in range(1, N):
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            if steps > RHO_MAX_ITERATIONS:
+                raise RuntimeError(f"Pollard-rho could not split {N} within RHO_MAX_ITERATIONS={RHO_MAX_ITERATIONS} steps.")
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % N
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % N
+                    q = q * abs(x - y) % N
+                g = gcd(q, N)
+                k += batch
+            steps += 2 * r
+            r *= 2
+
+        # the batch overshot, so step back through it one gcd at a time
+        if g == N:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % N
+                g = gcd(abs(x - ys), N)
+
+        # g == N means this polynomial cycled without splitting N, so try the next one
+        if g != N:
+            return g
+
+def _factor_large(N: int) -> list:
+    """
+    Factor an N larger than the sieve bound.
+
+    Only primes up to TRIAL_LIMIT are divided out, and the cofactor is split with
+    Miller-Rabin, integer roots of perfect powers and Pollard-rho, so a large prime
+    costs one primality test rather than trial division up to its square root.
+    Rho raises RuntimeError past RHO_MAX_ITERATIONS steps, e.g. on a product of
+    two primes near 2**64.
+
+    Parameters:
+    - N: the integer to factor.
+    """
+    _grow_sieve(TRIAL_LIMIT)
+    factors, N = _trial_division(N, TRIAL_LIMIT)
+
+    # split the cofactor until every piece is prime
+    stack = [N]
+    while stack:
+        n = stack.pop()
+        if n == 1:
+            continue
+        if is_prime(n):
+            factors.append(n)
+            continue
+
+        # rho needs about sqrt(p) steps on p**k, so take perfect powers apart by roots instead
+        root, k = _perfect_power(n, TRIAL_LIMIT)
+        if k > 1:
+            stack += [root] * k
+        else:
+            d = _pollard_brent(n)
+            stack += [d, n // d]
+
+    return sorted(factors)
+
+def factorize(values, bound: int = None) -> list:
+    """
+    Return the prime factors of every integer in values.
+
+    Values up to the bound are factored with a shared smallest-prime-factor sieve,
+    so each one costs O(log N) table lookups. Larger values have the primes up
+    to TRIAL_LIMIT divided out, and the rest is split with Miller-Rabin, integer
+    roots and Pollard-rho. Rho raises
+    RuntimeError when a value's two smallest prime factors are both too large
+    to find within RHO_MAX_ITERATIONS steps (above about 2**44).
+
+    Parameters:
+    - values: a list, tuple or NumPy integer array of positive integers.
+    - bound: the largest value to factor with the sieve (default: SIEVE_BOUND).
+    """
+    bound = SIEVE_BOUND if bound is None else bound
+    values = values.tolist() if isinstance(values, np.ndarray) else [int(v) for v in values]
+    if any(v < 1 for v in values):
+        raise ValueError("values must all be positive integers.")
+
+    factors = [[] for _ in values]
+    small = [i for i, v in enumerate(values) if v <= bound]
+    large = [i for i, v in enumerate(values) if v > bound]
+
+    # grow the sieve only as far as the in-range values need
+    _grow_sieve(max([values[i] for i in small], default=1))
+
+    # peel off the smallest prime factor of every in-range value at once
+    idx = np.array(small, dtype=np.int64)
+    n = np.array([values[i] for i in small], dtype=np.int64)
+    while len(n):
+        remaining = n > 1
+        idx, n = idx[remaining], n[remaining]
+        p = _spf[n]
+        for i, q in zip(idx.tolist(), p.tolist()):
+            factors[i].append(q)
+        n //= p
+
+    for i in large:
+        factors[i] = _factor_large(values[i])
+
+    return factors
+
 def get_prime_factors(N: int) -> list:
     """Return a list of all prime factors in N."""
-    factors = []
-    
-    # Check for number of 2s that divide N
-    while N % 2 == 0:
-        factors.append(2)
-        N //= 2
-
-    # look in the range from 3 to sqrt(N) and skip evens
-    for i in range(3, int(N**0.5) + 1, 2):
-        # While i divides N, add i and divide N
-        while N % i == 0:
-            factors.append(i)
-            N //= i
-
-    # If N is a prime number greater than 2, then add it to the list
-    if N > 2:
-        factors.append(N)
-
-    return factors
\ No newline at end of file
+    return factorize([N])[0]